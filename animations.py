@@ -1,8 +1,133 @@
 import random
 import time
-import cv2
-import numpy as np
 from config import THEMES, APP_INFO
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+class AnimationScheduler:
+    """Run every GUI animation from one shared Tk timer"""
+    def __init__(self, root, tick_ms=30, lag_budget_ms=20, busy_check=None):
+        self.root = root
+        self.tick_ms = tick_ms
+        self.lag_budget = lag_budget_ms / 1000.0
+        self.busy_check = busy_check  # Returns True while the preview presenter is backed up
+        self.animations = {}
+        self.running = False
+        self.paused = False
+        self.slowdown = 1.0  # Grows while the main loop is late, decays when it catches up
+        self.max_slowdown = 8.0
+        self.skipped_ticks = 0
+        self._after_id = None
+        self._expected_tick = None
+        
+        # Pause everything while the window is minimized or hidden
+        self.root.bind("<Unmap>", self._on_unmap, add="+")
+        self.root.bind("<Map>", self._on_map, add="+")
+        
+    def add(self, name, callback, interval_ms, essential=False, repeat=True):
+        """Register an animation step called every interval_ms"""
+        self.animations[name] = {
+            "callback": callback,
+            "interval": interval_ms / 1000.0,
+            "essential": essential,  # Essential steps still run when the loop is behind
+            "repeat": repeat,
+            "next_due": time.monotonic() + interval_ms / 1000.0
+        }
+        
+    def call_later(self, name, delay_ms, callback):
+        """Run a one-shot step on the shared tick (e.g. resetting a glitch)"""
+        self.add(name, callback, delay_ms, essential=True, repeat=False)
+        
+    def remove(self, name):
+        """Unregister an animation"""
+        self.animations.pop(name, None)
+        
+    def start(self):
+        """Start the shared tick"""
+        if self.running:
+            return
+        self.running = True
+        self._schedule(self.tick_ms)
+        
+    def stop(self):
+        """Stop the shared tick and drop all animations"""
+        self.running = False
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        self.animations.clear()
+        
+    def is_hidden(self):
+        """Check whether the window is minimized or withdrawn"""
+        try:
+            return self.root.state() in ("iconic", "withdrawn")
+        except Exception:
+            return True
+            
+    def _on_unmap(self, event):
+        if event.widget is self.root:
+            self.paused = True
+            
+    def _on_map(self, event):
+        if event.widget is self.root:
+            self.paused = False
+            # Don't replay every step that fell due while hidden
+            now = time.monotonic()
+            for animation in self.animations.values():
+                animation["next_due"] = max(animation["next_due"], now)
+                
+    def _schedule(self, delay_ms):
+        self._expected_tick = time.monotonic() + delay_ms / 1000.0
+        self._after_id = self.root.after(int(delay_ms), self._tick)
+        
+    def _tick(self):
+        """Shared tick: run due animations within the frame budget"""
+        self._after_id = None
+        if not self.running:
+            return
+            
+        now = time.monotonic()
+        
+        if self.paused or self.is_hidden():
+            # Poll slowly until the window comes back
+            self._schedule(self.tick_ms * self.max_slowdown)
+            return
+            
+        # The main loop is behind if this tick fired late or the preview is queued up
+        late = now - self._expected_tick
+        behind = late > self.lag_budget or (self.busy_check is not None and self.busy_check())
+        
+        if behind:
+            self.slowdown = min(self.max_slowdown, self.slowdown * 2)
+            self.skipped_ticks += 1
+        else:
+            self.slowdown = max(1.0, self.slowdown * 0.75)
+            
+        for name, animation in list(self.animations.items()):
+            if now < animation["next_due"]:
+                continue
+            if behind and not animation["essential"]:
+                # Skip this step and push it back by the current slowdown
+                animation["next_due"] = now + animation["interval"] * self.slowdown
+                continue
+                
+            try:
+                animation["callback"]()
+            except Exception as e:
+                print(f"Animation error ({name}): {str(e)}")
+                self.animations.pop(name, None)
+                continue
+                
+            if animation["repeat"]:
+                animation["next_due"] = now + animation["interval"] * self.slowdown
+            else:
+                self.animations.pop(name, None)
+                
+        self._schedule(self.tick_ms * self.slowdown)
 
 class FNAFAnimations:
     def __init__(self):
@@ -11,6 +136,7 @@ class FNAFAnimations:
         self.last_static_update = 0
         self.static_overlay = None
         self.static_update_interval = 1.0 / 30  # 30 FPS for static
+        self.scheduler = None
         
     def generate_static_overlay(self, frame_shape):
         """Generate static noise overlay similar to camera3"""
@@ -23,8 +149,18 @@ class FNAFAnimations:
             
         return self.static_overlay
         
+    def attach_scheduler(self, scheduler):
+        """Run animations from a shared AnimationScheduler"""
+        self.scheduler = scheduler
+        
     def animate_title(self, widget, theme):
         """Animate title with FNAF-style glitch effect"""
+        if self.scheduler is None:
+            return
+        self.scheduler.add("title_glitch", lambda: self.glitch_title_step(widget, theme), 30)
+        
+    def glitch_title_step(self, widget, theme):
+        """Single step of the title glitch animation"""
         if not self.animation_running:
             return
             
@@ -43,14 +179,13 @@ class FNAFAnimations:
             effect()
             
             # Reset after brief delay
-            widget.after(50, lambda: widget.configure(
+            self.scheduler.call_later("title_glitch_reset", 50, lambda: widget.configure(
                 text_color=THEMES[theme]["title"],
                 text=APP_INFO["title"]
             ))
         
-        # Continue animation more frequently
-        widget.after(30, lambda: self.animate_title(widget, theme))
-        
     def stop_animations(self):
         """Stop all animations"""
-        self.animation_running = False 
\ No newline at end of file
+        self.animation_running = False
+        if self.scheduler:
+            self.scheduler.stop()
@@ -0,0 +1,164 @@
+import json
+import os
+import time
+from config import CACHE_DIR
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+CACHE_VERSION = 1
+
+
+class AssetCache:
+    """On-disk cache of decoded, resized assets, one memory-mapped file per kind and resolution"""
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        
+    def index_path(self, kind, size):
+        width, height = size
+        return os.path.join(self.cache_dir, f"{kind}_{width}x{height}.json")
+        
+    def source_key(self, path):
+        """Cache key for a source file: name, mtime and size"""
+        stat = os.stat(path)
+        return [os.path.basename(path), stat.st_mtime_ns, stat.st_size]
+        
+    def load(self, kind, paths, size, channels, decode, progress_callback=None):
+        """Return a list of (H, W, C) uint8 arrays for paths, decoding only what the cache lacks
+        
+        decode(path, size) must return a uint8 array of shape (height, width, channels)
+        or None if the file can't be read.
+        """
+        keys = []
+        for path in paths:
+            try:
+                keys.append(self.source_key(path))
+            except OSError:
+                continue
+                
+        index, data = self.open(kind, size)
+        if index is not None and index["sources"] == keys:
+            # Cache hit: everything is a view into the mapped file
+            if progress_callback:
+                for _ in keys:
+                    progress_callback()
+            return [data[entry["slot"]] for entry in index["entries"]]
+            
+        return self.rebuild(kind, paths, keys, size, channels, decode, index, data, progress_callback)
+        
+    def lookup(self, kind, paths, size):
+        """Map the cache file and return {path: view} for entries whose source is unchanged"""
+        index, data = self.open(kind, size)
+        if index is None:
+            return {}
+            
+        slots = {tuple(entry["key"]): entry["slot"] for entry in index["entries"]}
+        views = {}
+        for path in paths:
+            try:
+                slot = slots.get(tuple(self.source_key(path)))
+            except OSError:
+                continue
+            if slot is not None:
+                views[path] = data[slot]
+        return views
+        
+    def open(self, kind, size):
+        """Map an existing cache file, returning (index, data) or (None, None)"""
+        try:
+            with open(self.index_path(kind, size), "r") as file:
+                index = json.load(file)
+            if index.get("version") != CACHE_VERSION:
+                return None, None
+            data = np.load(os.path.join(self.cache_dir, index["data"]), mmap_mode="r")
+            return index, data
+        except (OSError, ValueError, KeyError):
+            return None, None
+            
+    def rebuild(self, kind, paths, keys, size, channels, decode, old_index, old_data, progress_callback=None):
+        """Write a new cache file, reusing unchanged entries from the old one
+        
+        The data file is sized for every source up front and each frame is
+        written to its slot as soon as it is decoded, so only one decoded frame
+        is held at a time. Frames that fail to decode are left out of the
+        index; their slots at the end of the file stay unused.
+        """
+        width, height = size
+        reusable = {}
+        if old_index is not None:
+            for entry in old_index["entries"]:
+                reusable[tuple(entry["key"])] = old_data[entry["slot"]]
+                
+        key_by_name = {key[0]: key for key in keys}
+        sources = [(path, key_by_name[os.path.basename(path)]) for path in paths
+                   if os.path.basename(path) in key_by_name]
+        
+        data = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            
+            # New data file per generation: the old one may still be mapped by the video thread
+            data_name = f"{kind}_{width}x{height}.{time.time_ns()}.npy"
+            data_path = os.path.join(self.cache_dir, data_name)
+            data = np.lib.format.open_memmap(
+                data_path, mode="w+", dtype=np.uint8,
+                shape=(len(sources), height, width, channels)
+            )
+        except OSError as e:
+            # Cache is an optimization only: fall back to keeping the decoded images
+            print(f"Asset cache error: {str(e)}")
+            
+        images = []  # Only used without a cache file
+        entries = []
+        for path, key in sources:
+            img = reusable.get(tuple(key))
+            if img is None:
+                img = decode(path, size)
+            if img is not None:
+                if data is not None:
+                    data[len(entries)] = img
+                else:
+                    images.append(img)
+                entries.append({"key": key, "slot": len(entries)})
+            if progress_callback:
+                progress_callback()
+                
+        if data is None:
+            return images
+            
+        try:
+            data.flush()
+            index = {
+                "version": CACHE_VERSION,
+                "data": data_name,
+                "shape": [height, width, channels],
+                "sources": keys,
+                "entries": entries
+            }
+            index_path = self.index_path(kind, size)
+            with open(index_path + ".tmp", "w") as file:
+                json.dump(index, file)
+            os.replace(index_path + ".tmp", index_path)
+            
+            self.remove_stale(kind, size, keep=data_name)
+            
+            # Reopen read-only; the writable memmap stays live until this succeeds
+            mapped = np.load(data_path, mmap_mode="r")
+        except OSError as e:
+            # The frames are already in the data file even if the index couldn't be written
+            print(f"Asset cache error: {str(e)}")
+            return [data[entry["slot"]] for entry in entries]
+            
+        del data
+        return [mapped[entry["slot"]] for entry in entries]
+            
+    def remove_stale(self, kind, size, keep):
+        """Delete older data files for this kind and resolution"""
+        width, height = size
+        prefix = f"{kind}_{width}x{height}."
+        for file in os.listdir(self.cache_dir):
+            if file.startswith(prefix) and file.endswith(".npy") and file != keep:
+                try:
+                    os.remove(os.path.join(self.cache_dir, file))
+                except OSError:
+                    pass  # Still mapped somewhere (Windows); cleaned up next time
@@ -0,0 +1,193 @@
+import os
+import random
+from collections import OrderedDict
+from queue import Queue, Empty
+from threading import Thread, Lock
+from config import ensure_directories
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+
+def list_asset_files(directory, extensions):
+    """List image files in an asset directory in a stable order"""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.join(directory, file)
+        for file in os.listdir(directory)
+        if file.lower().endswith(extensions)
+    )
+
+
+class AssetLoader(Thread):
+    """Load effect assets in the background and report progress"""
+    def __init__(self, effects_manager, progress_callback=None, done_callback=None, size=None):
+        super().__init__(daemon=True)
+        self.effects_manager = effects_manager
+        self.size = size  # (width, height) to prepare, or None for the current resolution
+        self.progress_callback = progress_callback  # progress_callback(loaded, total)
+        self.done_callback = done_callback          # done_callback(error or None)
+        
+    def run(self):
+        error = None
+        try:
+            ensure_directories()
+            self.effects_manager.load_assets(self.progress_callback, self.size)
+        except Exception as e:
+            print(f"Asset loading error: {str(e)}")
+            error = e
+            
+        if self.done_callback:
+            self.done_callback(error)
+
+
+class AssetStore:
+    """Indexed asset directory that decodes on demand into a byte-budgeted LRU"""
+    def __init__(self, paths, size, decode, budget_bytes, cached_views=None, rng=None, deterministic=False):
+        self.paths = list(paths)
+        self.size = size
+        self.decode = decode                   # decode(path, size) -> array or None
+        self.budget_bytes = budget_bytes
+        self.cached_views = cached_views or {}  # {path: mmap view} from the on-disk AssetCache
+        self.resident = OrderedDict()           # index -> decoded array, oldest first
+        self.resident_bytes = 0
+        self.failed = set()
+        self.lock = Lock()
+        
+        # Anything with choice(); a seeded EffectRng makes the selection reproducible.
+        # deterministic stores wait for the chosen asset instead of substituting
+        # whichever one happens to be decoded, so seeded runs don't depend on timing.
+        self.rng = rng or random
+        self.deterministic = deterministic
+        
+        # Next glitch frame, chosen ahead of time so it can be decoded before it's needed
+        self.next_index = None
+        self.prefetch_queue = Queue()
+        self.prefetch_thread = None
+        self.closed = False
+        self.hits = 0
+        self.misses = 0
+        
+    def __len__(self):
+        return len(self.paths)
+        
+    def attach_cache(self, cached_views):
+        """Serve future loads from a freshly built on-disk cache"""
+        self.cached_views = cached_views
+        
+    def get(self, index, block=True):
+        """Return the decoded asset, decoding it now if block is True"""
+        with self.lock:
+            img = self.resident.get(index)
+            if img is not None:
+                self.resident.move_to_end(index)
+                self.hits += 1
+                return img
+        self.misses += 1
+        if not block:
+            return None
+        return self.load(index)
+        
+    def load(self, index):
+        """Decode an asset and add it to the LRU"""
+        if index in self.failed:
+            return None
+            
+        path = self.paths[index]
+        view = self.cached_views.get(path)
+        try:
+            # Copy out of the mapping so the byte budget reflects real residency
+            img = np.array(view) if view is not None else self.decode(path, self.size)
+        except Exception as e:
+            print(f"Asset decode error ({os.path.basename(path)}): {str(e)}")
+            img = None
+            
+        if img is None:
+            self.failed.add(index)
+            return None
+            
+        with self.lock:
+            if index not in self.resident:
+                self.resident[index] = img
+                self.resident_bytes += img.nbytes
+            self.resident.move_to_end(index)
+            
+            # Evict least recently used assets until we're back under budget
+            while self.resident_bytes > self.budget_bytes and len(self.resident) > 1:
+                _, evicted = self.resident.popitem(last=False)
+                self.resident_bytes -= evicted.nbytes
+        return img
+        
+    def choose(self):
+        """Return a random asset without blocking on a decode, or None if none is ready"""
+        if not self.paths:
+            return None
+            
+        index = self.next_index
+        img = self.get(index, block=self.deterministic) if index is not None else None
+        if img is None and not self.deterministic:
+            # The prefetch hasn't landed yet: use whatever is already decoded
+            with self.lock:
+                if self.resident:
+                    index = self.rng.choice(sorted(self.resident))
+                    img = self.resident[index]
+                    
+        self.prefetch_next()
+        return img
+        
+    def prefetch_next(self):
+        """Pick the next likely asset and decode it in the background"""
+        candidates = [i for i in range(len(self.paths)) if i not in self.failed]
+        if not candidates or self.closed:
+            return
+        self.next_index = self.rng.choice(candidates)
+        
+        if self.prefetch_thread is None:
+            self.prefetch_thread = Thread(target=self.prefetch_worker, daemon=True)
+            self.prefetch_thread.start()
+        self.prefetch_queue.put(self.next_index)
+        
+    def prefetch_worker(self):
+        while not self.closed:
+            try:
+                index = self.prefetch_queue.get(timeout=1.0)
+            except Empty:
+                continue
+            if index is None:
+                break
+            with self.lock:
+                resident = index in self.resident
+            if not resident:
+                self.load(index)
+                
+    def updated(self, paths, changed, rng=None):
+        """Return a new store for paths, keeping decoded assets whose files didn't change"""
+        store = AssetStore(
+            paths, self.size, self.decode, self.budget_bytes,
+            rng=rng or self.rng, deterministic=self.deterministic
+        )
+        new_index = {path: i for i, path in enumerate(store.paths)}
+        
+        with self.lock:
+            for old_index, img in self.resident.items():
+                path = self.paths[old_index]
+                if path in changed or path not in new_index:
+                    continue
+                store.resident[new_index[path]] = img
+                store.resident_bytes += img.nbytes
+                
+        store.cached_views = {
+            path: view for path, view in self.cached_views.items()
+            if path in new_index and path not in changed
+        }
+        store.prefetch_next()
+        return store
+        
+    def close(self):
+        """Stop the prefetch thread and drop resident assets"""
+        self.closed = True
+        self.prefetch_queue.put(None)
+        with self.lock:
+            self.resident.clear()
+            self.resident_bytes = 0
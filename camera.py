@@ -1,9 +1,19 @@
-import cv2
-import pyvirtualcam
-from pyvirtualcam import PixelFormat
+from concurrent.futures import ThreadPoolExecutor
 from threading import Thread
 import time
 import os
+from lazy_import import lazy_import
+from config import DEFAULT_SETTINGS
+from pipeline import ProcessingScaler, OutputFanout, Sink, FrameRing, interpolation_flag
+from recorder import Recorder
+from replay import ReplayBuffer
+from mjpeg import MjpegStream
+from pacing import FramePacer
+from tracing import tracer
+from metrics import metrics
+
+cv2 = lazy_import("cv2")
+pyvirtualcam = lazy_import("pyvirtualcam")
 
 class CameraManager:
     def __init__(self):
@@ -11,8 +21,31 @@ class CameraManager:
         self.virtual_camera = None
         self.running = False
         self.preview_callback = None
-        self.fps = 30
+        self.fps = DEFAULT_SETTINGS["fps"]
+        self.pacer = None  # Sends to the virtual camera at a steady self.fps
         self.virtual_camera_enabled = True
+        self.virtual_device = None  # pyvirtualcam device name, None for the backend default
+        self.frame_size = None  # (width, height) reported by the driver
+        self.recorder = None
+        self.replay = None
+        self.mjpeg = None
+        
+        # Snapshots read the newest processed frame here instead of the capture device
+        self.frame_ring = FrameRing(DEFAULT_SETTINGS["frame_ring_size"])
+        self.snapshot_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="snapshot")
+        self.scaler = ProcessingScaler(DEFAULT_SETTINGS["output_scale"], DEFAULT_SETTINGS["preview_scale"])
+        
+        # Every consumer of processed frames declares its size and pixel format
+        self.fanout = OutputFanout()
+        self.fanout.add_sink(Sink(
+            "virtual_camera", self.send_virtual_camera,
+            scale=1.0, pixel_format="BGR",
+            interpolation=DEFAULT_SETTINGS["output_interpolation"], allow_upscale=True
+        ))
+        self.fanout.add_sink(Sink(
+            "preview", self.send_preview,
+            scale=DEFAULT_SETTINGS["preview_scale"], pixel_format="RGB"
+        ))
         
     def get_available_cameras(self):
         """Detect available cameras using DirectShow"""
@@ -30,42 +63,80 @@ class CameraManager:
         return cameras
     
     def set_preview_callback(self, callback):
-        """Set callback function for preview updates"""
+        """Set callback function for preview updates (called with RGB frames)"""
         self.preview_callback = callback
         
+    def send_preview(self, frame):
+        if self.preview_callback:
+            self.preview_callback(frame)
+            
+    def send_virtual_camera(self, frame):
+        if self.pacer:
+            # The frame's trace travels with it so the send can be timed on the pacer thread
+            self.pacer.submit((frame, tracer.current()))
+            
+    def emit_virtual_camera(self, item):
+        """Called by the pacer at each output deadline"""
+        frame, trace = item
+        if self.virtual_camera and self.virtual_camera_enabled:
+            start = time.perf_counter()
+            self.virtual_camera.send(frame)
+            tracer.frame_sent(trace, start, time.perf_counter())
+        
     def start_camera(self, camera_index):
         """Start capturing from selected camera"""
         try:
+            self.frame_ring.clear()
             self.cap = cv2.VideoCapture(camera_index, cv2.CAP_DSHOW)
             if not self.cap.isOpened():
+                self.release_capture()
                 return False
                 
             # Set camera properties
             self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+            width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            self.frame_size = (width, height)
             
             # Initialize virtual camera if enabled
             if self.virtual_camera_enabled:
-                width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
                 self.virtual_camera = pyvirtualcam.Camera(
                     width=width,
                     height=height,
                     fps=self.fps,
-                    fmt=PixelFormat.BGR
+                    fmt=pyvirtualcam.PixelFormat.BGR,
+                    device=self.virtual_device
                 )
+                self.pacer = FramePacer(self.fps, self.emit_virtual_camera)
+                self.pacer.start()
             
             self.running = True
+            if DEFAULT_SETTINGS["replay_enabled"]:
+                self.start_replay()
             return True
             
         except Exception as e:
             print(f"Error starting camera: {str(e)}")
+            # e.g. the virtual camera device is missing or already in use
+            self.release_capture()
             return False
             
+    def release_capture(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+            
     def stop_camera(self):
         """Stop camera capture"""
         self.running = False
+        self.stop_recording()
+        self.stop_replay()
         if self.cap:
             self.cap.release()
+        if self.pacer:
+            self.pacer.stop()
+            self.pacer.join(1.0)
+            self.pacer = None
         if self.virtual_camera:
             self.virtual_camera.close()
             
@@ -74,39 +145,187 @@ class CameraManager:
         self.fps = fps
         if self.cap:
             self.cap.set(cv2.CAP_PROP_FPS, fps)
+        if self.pacer:
+            self.pacer.set_fps(fps)
+            
+    def processing_size(self):
+        """Size the effect chain currently runs at"""
+        output_active = self.virtual_camera_enabled and self.virtual_camera is not None
+        return self.scaler.processing_size(self.frame_size, output_active)
+        
+    def set_processing_scale(self, output_scale=None, preview_scale=None, interpolation=None):
+        """Change the effect chain resolution for the output and preview paths"""
+        if output_scale is not None:
+            self.scaler.output_scale = output_scale
+        if preview_scale is not None:
+            self.scaler.preview_scale = preview_scale
+            self.fanout.get_sink("preview").scale = preview_scale
+        if interpolation is not None:
+            self.fanout.get_sink("virtual_camera").interpolation = interpolation
             
-    def capture_frame(self, save_dir):
-        """Capture single frame and save to file"""
-        if not self.cap:
+    def start_recording(self, path, settings=None):
+        """Record processed frames to a video file through a recorder sink"""
+        settings = {**DEFAULT_SETTINGS, **(settings or {})}
+        self.stop_recording()
+        self.recorder = Recorder(
+            path,
+            fps=self.fps,
+            codec=settings["record_codec"],
+            queue_size=settings["record_queue_size"],
+            drop_policy=settings["record_drop_policy"]
+        )
+        self.recorder.start()
+        self.fanout.add_sink(Sink(
+            "recorder", self.recorder.push,
+            scale=settings["record_scale"], pixel_format="BGR", allow_upscale=True
+        ))
+        return self.recorder
+        
+    def stop_recording(self):
+        """Detach the recorder sink and let it flush its queue in the background"""
+        recorder, self.recorder = self.recorder, None
+        if recorder is None:
             return None
+        self.fanout.remove_sink("recorder")
+        Thread(target=recorder.stop, daemon=True).start()
+        return recorder
+        
+    def start_replay(self, settings=None):
+        """Keep the last few seconds of output in a compressed replay buffer"""
+        settings = {**DEFAULT_SETTINGS, **(settings or {})}
+        self.stop_replay()
+        self.replay = ReplayBuffer(
+            seconds=settings["replay_seconds"],
+            budget_bytes=settings["replay_budget_mb"] * 1024 * 1024,
+            jpeg_quality=settings["replay_jpeg_quality"],
+            codec=settings["record_codec"]
+        )
+        self.replay.start()
+        self.fanout.add_sink(Sink(
+            "replay", self.replay.push,
+            scale=settings["replay_scale"], pixel_format="BGR"
+        ))
+        return self.replay
+        
+    def stop_replay(self):
+        """Stop buffering; footage already held can still be saved"""
+        self.fanout.remove_sink("replay")
+        if self.replay is not None:
+            self.replay.stop()
             
-        ret, frame = self.cap.read()
-        if ret:
-            timestamp = time.strftime("%Y%m%d-%H%M%S")
-            filename = f"capture_{timestamp}.png"
-            filepath = os.path.join(save_dir, filename)
-            cv2.imwrite(filepath, frame)
-            return filename
-        return None
+    def save_replay(self, path, done_callback=None):
+        """Write the buffered footage to a clip in the background"""
+        if self.replay is None:
+            return False
+        return self.replay.save_clip(path, done_callback)
+        
+    def start_mjpeg(self, settings=None):
+        """Serve the output as an MJPEG stream over HTTP; returns the server or None"""
+        settings = {**DEFAULT_SETTINGS, **(settings or {})}
+        self.stop_mjpeg()
+        try:
+            stream = MjpegStream(settings["mjpeg_port"], settings["mjpeg_host"], settings["mjpeg_jpeg_quality"])
+        except OSError as e:
+            print(f"MJPEG server error: {str(e)}")
+            return None
+        # Stays disabled, so nothing is resized or encoded, until a client connects
+        sink = Sink("mjpeg", stream.push, scale=settings["mjpeg_scale"], pixel_format="BGR")
+        sink.enabled = False
+        stream.sink = sink
+        self.fanout.add_sink(sink)
+        stream.start()
+        self.mjpeg = stream
+        return stream
+        
+    def stop_mjpeg(self):
+        stream, self.mjpeg = self.mjpeg, None
+        if stream is None:
+            return
+        self.fanout.remove_sink("mjpeg")
+        stream.stop()
+            
+    def health_stats(self):
+        """Dropped-frame counts and queue depths of the outputs, for monitoring"""
+        dropped = {}
+        queued = {}
+        if self.pacer:
+            dropped["virtual_camera"] = self.pacer.dropped
+        if self.recorder:
+            stats = self.recorder.stats()
+            dropped["recorder"] = stats["dropped"]
+            queued["recorder"] = stats["queue_depth"]
+        if self.replay:
+            dropped["replay"] = self.replay.dropped
+            queued["replay"] = self.replay.incoming.qsize()
+        if self.mjpeg:
+            dropped["mjpeg"] = self.mjpeg.skipped
+        return {"dropped": dropped, "queued": queued}
+        
+    def capture_frame(self, save_dir, done_callback=None, image_format=None, jpeg_quality=None):
+        """Save the newest processed frame; encoding happens on the snapshot pool
+        
+        Returns the filename that will be written, or None when no frame has been
+        processed yet. done_callback(filename, error) runs on a pool thread.
+        """
+        frame, capture_size = self.frame_ring.latest()
+        if frame is None:
+            return None
+            
+        image_format = (image_format or DEFAULT_SETTINGS["snapshot_format"]).lower()
+        quality = jpeg_quality or DEFAULT_SETTINGS["snapshot_jpeg_quality"]
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        filename = f"capture_{timestamp}.{image_format}"
+        filepath = os.path.join(save_dir, filename)
+        interpolation = self.fanout.get_sink("virtual_camera").interpolation
+        
+        def encode():
+            error = None
+            try:
+                # Snapshots are saved at the capture resolution, like the virtual camera
+                image = frame
+                if capture_size and (image.shape[1], image.shape[0]) != tuple(capture_size):
+                    image = cv2.resize(image, capture_size, interpolation=interpolation_flag(interpolation))
+                params = [cv2.IMWRITE_JPEG_QUALITY, quality] if image_format in ("jpg", "jpeg") else []
+                os.makedirs(save_dir, exist_ok=True)
+                if not cv2.imwrite(filepath, image, params):
+                    raise RuntimeError(f"Could not write {filename}")
+            except Exception as e:
+                print(f"Capture error: {str(e)}")
+                error = e
+            if done_callback:
+                done_callback(filename, error)
+                
+        self.snapshot_pool.submit(encode)
+        return filename
         
     def process_video(self, effects_manager=None, settings=None):
         """Process video feed with effects"""
         while self.running:
+            capture_start = time.perf_counter()
             ret, frame = self.cap.read()
             if not ret:
                 break
+            capture_end = time.perf_counter()
+            tracer.begin_frame(capture_start, capture_end)
                 
-            # Apply effects if available
+            capture_size = (frame.shape[1], frame.shape[0])
+            output_active = self.virtual_camera_enabled and self.virtual_camera is not None
+            
+            # Apply effects if available, at the processing resolution
             if effects_manager:
+                processing_size = self.scaler.processing_size(capture_size, output_active)
+                with tracer.span("downscale"):
+                    frame = self.scaler.downscale(frame, processing_size)
                 frame = effects_manager.apply_effects(frame, settings)
+                frame = effects_manager.apply_hud(frame)
                 
-            # Update preview
-            if self.preview_callback:
-                self.preview_callback(frame)
+            self.frame_ring.push(frame, capture_size)
                 
-            # Send to virtual camera if enabled
-            if self.virtual_camera_enabled and self.virtual_camera:
-                self.virtual_camera.send(frame)
+            # Hand the frame to every output at its own size and format
+            self.fanout.get_sink("virtual_camera").enabled = output_active
+            self.fanout.deliver(frame, capture_size)
+            tracer.end_frame()
+            metrics.frames_total.inc()
+            metrics.frame_seconds.observe(time.perf_counter() - capture_end)
                 
             yield frame
-    
\ No newline at end of file
@@ -0,0 +1,56 @@
+import time
+
+TICK_RATE = 30.0  # Random layers regenerated per second at speed 1.0
+
+
+class EffectClock:
+    """Shared timebase for the effect chain, advanced once per frame
+
+    "monotonic" follows the wall clock; "frame" advances by exactly 1/fps per
+    frame, so offline renders and benchmarks do not depend on how long each
+    frame took to process.
+    """
+    def __init__(self, mode="monotonic", fps=30, speed=1.0):
+        self.mode = mode
+        self.fps = fps
+        self.speed = speed  # Global multiplier on top of each effect's own speed
+        self.frame_index = 0
+        self.start_time = time.monotonic()
+        self.now = 0.0  # Seconds since the clock started
+
+    def advance(self):
+        """Move to the next frame"""
+        self.frame_index += 1
+        if self.mode == "frame":
+            self.now = self.frame_index / max(1, self.fps)
+        else:
+            self.now = time.monotonic() - self.start_time
+        return self.now
+
+    def timer(self, rate=TICK_RATE):
+        return EffectTimer(self, rate)
+
+
+class EffectTimer:
+    """One effect's view of the clock: scaled time and ticks at rate x speed per second"""
+    def __init__(self, clock, rate=TICK_RATE):
+        self.clock = clock
+        self.rate = rate
+        self.last_now = clock.now
+        self.elapsed = 0.0  # Effect time in seconds, scaled by speed
+        self.tick_index = None
+
+    def advance(self, speed=1.0):
+        """Scaled effect time for the current frame (repeat calls in one frame are free)"""
+        delta = self.clock.now - self.last_now
+        self.last_now = self.clock.now
+        self.elapsed += delta * max(0.0, speed) * self.clock.speed
+        return self.elapsed
+
+    def ticked(self, speed=1.0):
+        """True on the first frame of each new tick; cached layers are reused otherwise"""
+        tick = int(self.advance(speed) * self.rate)
+        if tick == self.tick_index:
+            return False
+        self.tick_index = tick
+        return True
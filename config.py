@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 # Paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -6,10 +7,18 @@ STATIC_DIR = os.path.join(BASE_DIR, "static")
 FRAMES_DIR = os.path.join(STATIC_DIR, "frames")
 EXTRA_DIR = os.path.join(STATIC_DIR, "extra")
 FONTS_DIR = os.path.join(BASE_DIR, "fonts")
+CACHE_DIR = os.path.join(STATIC_DIR, ".cache")
+RECORDINGS_DIR = os.path.join(BASE_DIR, "recordings")
+CAPTURES_DIR = os.path.join(BASE_DIR, "captures")
+PRESETS_DIR = os.path.join(BASE_DIR, "presets")
 
-# Create directories if they don't exist
-for dir_path in [STATIC_DIR, FRAMES_DIR, EXTRA_DIR]:
-    os.makedirs(dir_path, exist_ok=True)
+# Asset size used until the camera reports its resolution
+DEFAULT_ASSET_SIZE = (640, 480)
+
+def ensure_directories():
+    """Create asset directories if they don't exist (called on first use, not on import)"""
+    for dir_path in [STATIC_DIR, FRAMES_DIR, EXTRA_DIR]:
+        os.makedirs(dir_path, exist_ok=True)
 
 # Default settings
 DEFAULT_SETTINGS = {
@@ -39,8 +48,13 @@ DEFAULT_SETTINGS = {
     "tracking_intensity": 0.3,
     
     "artifacts_enabled": False,
+    "artifacts_density": 1.0,  # Multiplier on the number of artifact blocks per frame
     "artifacts_intensity": 0.3,
     
+    # Extra images from static/extra drawn over the frame (intensity = opacity)
+    "overlay_enabled": False,
+    "overlay_intensity": 1.0,
+    
     # Additional settings
     "theme": "dark",
     
@@ -52,8 +66,29 @@ DEFAULT_SETTINGS = {
 # Add to DEFAULT_SETTINGS
 DEFAULT_SETTINGS.update({
     # Camera settings
-    "fps": 10,
+    "fps": 30,  # Capture and virtual camera output rate
     "effect_speed": 1.0,
+    "effect_clock": "monotonic",  # monotonic, or frame (fixed 1/fps steps for offline renders)
+    "effect_seed": None,  # Fixed seed makes the random effects reproducible
+    
+    # A stage failing this many frames in a row is switched off; its errors are
+    # logged at most once per stage_log_interval seconds
+    "stage_failure_limit": 5,
+    "stage_log_interval": 5.0,
+    
+    # Per-frame span tracing for latency measurement (ring of the newest trace_frames frames)
+    "tracing_enabled": True,
+    "trace_frames": 1800,
+    
+    # Prometheus metrics on http://127.0.0.1:<metrics_port>/metrics
+    "metrics_enabled": False,
+    "metrics_port": 9464,
+    
+    # Control API for stream decks and scripts: newline-delimited JSON on a UNIX
+    # socket, or on 127.0.0.1:<control_port> where UNIX sockets are unavailable
+    "control_enabled": False,
+    "control_socket": os.path.join(tempfile.gettempdir(), "fnaf-camera.sock"),
+    "control_port": 9465,
     
     # Effect speeds (multipliers)
     "static_speed": 1.0,
@@ -65,6 +100,7 @@ DEFAULT_SETTINGS.update({
     "chromatic_speed": 1.0,
     "tracking_speed": 1.0,
     "artifacts_speed": 1.0,
+    "overlay_speed": 1.0,
     
     # Glitch timing settings
     "glitch_duration": 2.0,      # Each frame lasts 5 seconds
@@ -72,6 +108,54 @@ DEFAULT_SETTINGS.update({
     "glitch_burst_chance": 2.5,  # Chance for multi-frame bursts
     "glitch_frames_in_burst": [1, 2, 3],  # Possible number of frames in sequence
     "glitch_blend_alpha": 1.0,   # Blend ratio
+    "glitch_cache_mb": 256,      # Memory budget for decoded glitch frames
+    "hot_reload_enabled": True,  # Pick up new/changed files in static/ while running
+    
+    # Camera HUD burned into the output
+    "hud_enabled": False,
+    "hud_camera_label": "CAM 1A",
+    "hud_clock_format": "%H:%M:%S",
+    
+    # .cube 3D LUT applied after colour distortion ("" for none)
+    "color_lut_path": "",
+    
+    # Single-channel pipeline for greyscale / night-vision looks, tinted at the output (BGR)
+    "monochrome_enabled": False,
+    "monochrome_tint": [255, 255, 255],
+    
+    # Reduced-resolution processing: effects run at scale x capture size, then the
+    # virtual camera output is upscaled once with output_interpolation
+    # (nearest, linear, cubic, area or lanczos)
+    "output_scale": 1.0,
+    "preview_scale": 0.5,
+    "output_interpolation": "linear",
+    
+    # Recording: frames are queued for a background encoder; when it falls behind,
+    # record_drop_policy "oldest" evicts queued frames and "newest" skips new ones
+    "record_codec": "mp4v",
+    "record_scale": 1.0,
+    "record_queue_size": 60,
+    "record_drop_policy": "oldest",
+    
+    # Snapshots come from a ring of recent processed frames and are encoded in the background
+    "frame_ring_size": 8,
+    "snapshot_format": "png",  # png or jpg
+    "snapshot_jpeg_quality": 95,
+    
+    # Instant replay: the last replay_seconds of output kept as JPEGs within replay_budget_mb
+    "replay_enabled": True,
+    "replay_seconds": 30,
+    "replay_budget_mb": 128,
+    "replay_scale": 1.0,
+    "replay_jpeg_quality": 80,
+    
+    # MJPEG preview stream at http://<host>:<mjpeg_port>/ for watching from another
+    # machine; frames are only encoded while someone is connected
+    "mjpeg_enabled": False,
+    "mjpeg_host": "0.0.0.0",
+    "mjpeg_port": 8080,
+    "mjpeg_scale": 0.5,
+    "mjpeg_jpeg_quality": 70,
 })
 
 # Add version info
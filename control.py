@@ -0,0 +1,173 @@
+"""Local control API for stream decks and scripts
+
+Clients send one JSON object per line and get one JSON reply per line:
+
+    {"cmd": "intensity", "effect": "static", "value": 0.6}
+    {"cmd": "toggle", "effect": "vhs", "enabled": true}   (omit enabled to flip)
+    {"cmd": "speed", "effect": "noise", "value": 2.0}
+    {"cmd": "glitch", "frames": 3}                        (frames optional)
+    {"cmd": "set", "enabled": {...}, "intensities": {...}, "speeds": {...}}
+    {"cmd": "preset", "name": "night"}
+    {"cmd": "save_preset", "name": "night"}
+    {"cmd": "list_presets"}
+    {"cmd": "state"}
+
+Add "camera": <index> to any command to address one of the multi-camera
+pipelines instead of the main camera.
+
+Changes are queued on the effects and applied together at the next frame
+boundary, so a preset or a multi-value "set" never lands half way through a
+frame. The reply is sent as soon as the change is queued. While no camera is
+running the GUI applies queued changes itself, a few times a second.
+"""
+import json
+import os
+import socket
+import socketserver
+import threading
+from presets import list_presets, load_preset, save_preset
+
+
+class ControlHandler(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        if self.server.address_family != getattr(socket, "AF_UNIX", None):
+            # Replies are tiny; don't let Nagle hold them back
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def handle(self):
+        for line in self.rfile:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                command = json.loads(line)
+                if not isinstance(command, dict):
+                    raise ValueError("Expected a JSON object")
+                reply = self.server.control.execute(command)
+            except (ValueError, KeyError, TypeError, AttributeError, OSError) as e:
+                reply = {"ok": False, "error": str(e)}
+            self.wfile.write((json.dumps(reply) + "\n").encode())
+
+
+class ControlTCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+
+
+class EffectControl:
+    """Turn control commands into change sets for an FNAFEffects"""
+    def __init__(self, effects, cameras=None):
+        self.effects = effects
+        self.cameras = cameras  # cameras(index) -> a multi-camera pipeline's effects
+
+    def execute(self, command):
+        name = command.get("cmd")
+        effects = self.target(command)
+        if name == "state":
+            return {"ok": True, "state": effects.settings_snapshot()}
+        if name == "list_presets":
+            return {"ok": True, "presets": list_presets()}
+        if name == "save_preset":
+            save_preset(command["name"], effects.settings_snapshot())
+            return {"ok": True}
+
+        changes = self.changes(name, command)
+        effects.queue_changes(changes)
+        return {"ok": True, "queued": changes}
+
+    def target(self, command):
+        """The main camera's effects, or a pipeline's when the command names a camera"""
+        if command.get("camera") is None:
+            return self.effects
+        if self.cameras is None:
+            raise ValueError("No multi-camera pipelines are available")
+        return self.cameras(int(command["camera"]))
+
+    def changes(self, name, command):
+        if name == "intensity":
+            return {"intensities": {self.effect(command["effect"], intensity=True): float(command["value"])}}
+        if name == "speed":
+            return {"speeds": {self.effect(command["effect"]): float(command["value"])}}
+        if name == "toggle":
+            effect = self.effect(command["effect"])
+            if "enabled" in command:
+                return {"enabled": {effect: bool(command["enabled"])}}
+            return {"toggle": [effect]}
+        if name == "glitch":
+            return {"glitch": max(0, int(command.get("frames", 0)))}
+        if name == "preset":
+            changes = self.validate(load_preset(command["name"]))
+            changes["preset"] = str(command["name"])
+            return changes
+        if name == "set":
+            return self.validate(command)
+        raise ValueError(f"Unknown command: {name!r}")
+
+    def validate(self, settings):
+        """Keep only known settings, with the types the effects expect"""
+        if not isinstance(settings, dict):
+            raise ValueError("Expected settings as a JSON object")
+        for key in ("enabled", "intensities", "speeds"):
+            if key in settings and not isinstance(settings[key], dict):
+                raise ValueError(f"Expected \"{key}\" as a JSON object of effect: value")
+                
+        changes = {}
+        if "enabled" in settings:
+            changes["enabled"] = {self.effect(k): bool(v) for k, v in settings["enabled"].items()}
+        if "intensities" in settings:
+            changes["intensities"] = {
+                self.effect(k, intensity=True): float(v) for k, v in settings["intensities"].items()
+            }
+        if "speeds" in settings:
+            changes["speeds"] = {self.effect(k): float(v) for k, v in settings["speeds"].items()}
+        for key in ("hud_enabled", "monochrome_enabled"):
+            if key in settings:
+                changes[key] = bool(settings[key])
+        return changes
+
+    def effect(self, name, intensity=False):
+        known = self.effects.effect_intensities if intensity else self.effects.effect_speeds
+        if name not in known:
+            raise ValueError(f"Unknown effect: {name!r}")
+        return name
+
+
+class ControlServer(threading.Thread):
+    """Serve the control API on a UNIX socket, or on localhost TCP as a fallback"""
+    def __init__(self, effects, path=None, port=9465, host="127.0.0.1", cameras=None):
+        super().__init__(daemon=True)
+        self.path = None
+        if path and hasattr(socketserver, "ThreadingUnixStreamServer"):
+            self.remove_stale_socket(path)
+            self.server = socketserver.ThreadingUnixStreamServer(path, ControlHandler)
+            os.chmod(path, 0o600)  # Only this user can drive the effects
+            self.path = path
+            self.address = path
+        else:
+            self.server = ControlTCPServer((host, port), ControlHandler)
+            self.address = f"{host}:{port}"
+        self.server.daemon_threads = True
+        self.server.control = EffectControl(effects, cameras)
+
+    def remove_stale_socket(self, path):
+        """Clear a socket file left by a previous run, but not one still in use"""
+        if not os.path.exists(path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)
+            return
+        finally:
+            probe.close()
+        raise OSError(f"Control socket {path} is already in use")
+
+    def run(self):
+        self.server.serve_forever()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.path and os.path.exists(self.path):
+            os.unlink(self.path)
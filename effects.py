@@ -1,15 +1,68 @@
-import cv2
-import numpy as np
-import random
 import time
-import os
-from config import FRAMES_DIR, EXTRA_DIR, DEFAULT_SETTINGS
+from collections import deque
+from threading import Lock
+from config import FRAMES_DIR, EXTRA_DIR, DEFAULT_SETTINGS, DEFAULT_ASSET_SIZE, ensure_directories
 from animations import FNAFAnimations
+from assets import list_asset_files, AssetLoader, AssetStore
+from asset_cache import AssetCache
+from watcher import AssetWatcher
+from overlay import OverlayCompositor, OverlayLayer
+from hud import HudOverlay
+from luts import channel_lut, CubeLut
+from clock import EffectClock
+from rng import EffectRng
+from faults import StageGuard
+from lazy_import import lazy_import
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+ARTIFACT_SIZE_STEP = 5  # Artifact block sizes snap to this many pixels
 
 class FNAFEffects:
-    def __init__(self, animations=None):
-        self.preloaded_images = self.load_frames()
-        self.extra_images = self.load_extra_images()
+    def __init__(self, animations=None, assets_from=None):
+        # Extra camera pipelines read the glitch frames and extras of assets_from
+        # instead of loading their own copies
+        self.asset_source = assets_from
+        
+        # Filled in by load_assets(), normally from a background AssetLoader
+        self.asset_cache = AssetCache()
+        self.glitch_cache_bytes = int(DEFAULT_SETTINGS["glitch_cache_mb"] * 1024 * 1024)
+        self.glitch_frames = AssetStore([], DEFAULT_ASSET_SIZE, self.decode_frame, self.glitch_cache_bytes)
+        self.extra_images = []
+        self.overlay_layer = None  # Extras flattened for the current resolution, built by the loader
+        self.overlay = OverlayCompositor()
+        self.hud = HudOverlay()
+        
+        # Colour distortion LUT and optional .cube grading LUT
+        self.color_offsets = (0, 0, 0)
+        self.color_lut = None
+        self.color_lut_key = None
+        self.grade_lut = None
+        
+        # Single-channel pipeline for greyscale / night-vision looks
+        self.monochrome_enabled = DEFAULT_SETTINGS["monochrome_enabled"]
+        self.monochrome_tint = tuple(DEFAULT_SETTINGS["monochrome_tint"])
+        self.tint_lut = None
+        self.tint_key = None
+        self.hud_enabled = DEFAULT_SETTINGS["hud_enabled"]
+        self.hud_camera_label = DEFAULT_SETTINGS["hud_camera_label"]
+        self.hud_clock_format = DEFAULT_SETTINGS["hud_clock_format"]
+        
+        # Assets are prepared at the live pipeline resolution (width, height)
+        self.asset_resolution = DEFAULT_ASSET_SIZE
+        self.pending_resolution = None
+        self.asset_lock = Lock()
+        
+        # Hot-reloaded assets wait here until the next frame boundary
+        self.staged_assets = None
+        self.watcher = None
+        
+        # Control API change sets wait here until the next frame boundary;
+        # settings_changed_callback(applied) lets the GUI follow them
+        self.pending_changes = deque()
+        self.changes_lock = Lock()  # The GUI drains the queue itself while no camera runs
+        self.settings_changed_callback = None
         self.last_glitch_time = 0
         self.last_extra_time = 0
         self.glitch_active = False
@@ -18,17 +71,41 @@ class FNAFEffects:
         
         # Make sure we initialize these dictionaries
         self.effect_speeds = {
-            "static": 1.0,
-            "glitch": 1.0,
-            "tear": 1.0,
-            "vhs": 1.0,
-            "noise": 1.0,
-            "color_distortion": 1.0,
-            "chromatic": 1.0,
-            "tracking": 1.0,
-            "artifacts": 1.0
+            "static": DEFAULT_SETTINGS["static_speed"],
+            "glitch": DEFAULT_SETTINGS["glitch_speed"],
+            "tear": DEFAULT_SETTINGS["tear_speed"],
+            "vhs": DEFAULT_SETTINGS["vhs_speed"],
+            "noise": DEFAULT_SETTINGS["noise_speed"],
+            "color_distortion": DEFAULT_SETTINGS["color_distortion_speed"],
+            "chromatic": DEFAULT_SETTINGS["chromatic_speed"],
+            "tracking": DEFAULT_SETTINGS["tracking_speed"],
+            "artifacts": DEFAULT_SETTINGS["artifacts_speed"],
+            "overlay": DEFAULT_SETTINGS["overlay_speed"]
         }
         
+        # Each effect runs on the shared clock at its own speed; random layers are
+        # only regenerated when their effect's timer ticks
+        self.clock = EffectClock(DEFAULT_SETTINGS["effect_clock"], DEFAULT_SETTINGS["fps"], DEFAULT_SETTINGS["effect_speed"])
+        self.effect_seed = DEFAULT_SETTINGS["effect_seed"]
+        self.rng = EffectRng(self.effect_seed)
+        self.artifacts_density = DEFAULT_SETTINGS["artifacts_density"]
+        
+        # Per-stage fault isolation; stage_disabled_callback(name, error) lets the GUI react
+        self.stage_disabled_callback = None
+        self.stages = StageGuard(
+            DEFAULT_SETTINGS["stage_failure_limit"],
+            DEFAULT_SETTINGS["stage_log_interval"],
+            self.disable_stage
+        )
+        if DEFAULT_SETTINGS["color_lut_path"]:
+            try:
+                self.load_color_lut(DEFAULT_SETTINGS["color_lut_path"])
+            except Exception as e:
+                print(f"Error loading colour LUT: {str(e)}")
+        self.timers = {effect: self.clock.timer() for effect in self.effect_speeds}
+        self.layers = {}
+        self.tracking_band = None
+        
         # Initialize effect states from DEFAULT_SETTINGS
         self.effect_enabled = {
             "static": DEFAULT_SETTINGS["static_enabled"],
@@ -39,7 +116,8 @@ class FNAFEffects:
             "color_distortion": DEFAULT_SETTINGS["color_distortion_enabled"],
             "chromatic": DEFAULT_SETTINGS["chromatic_enabled"],
             "tracking": DEFAULT_SETTINGS["tracking_enabled"],
-            "artifacts": DEFAULT_SETTINGS["artifacts_enabled"]
+            "artifacts": DEFAULT_SETTINGS["artifacts_enabled"],
+            "overlay": DEFAULT_SETTINGS["overlay_enabled"]
         }
         
         # Initialize effect intensities
@@ -53,6 +131,7 @@ class FNAFEffects:
             "chromatic": DEFAULT_SETTINGS["chromatic_intensity"],
             "tracking": DEFAULT_SETTINGS["tracking_intensity"],
             "artifacts": DEFAULT_SETTINGS["artifacts_intensity"],
+            "overlay": DEFAULT_SETTINGS["overlay_intensity"],
             "glitch_duration": DEFAULT_SETTINGS["glitch_duration"],
             "glitch_frequency": DEFAULT_SETTINGS["glitch_frequency"],
             "glitch_burst_chance": DEFAULT_SETTINGS["glitch_burst_chance"]
@@ -61,97 +140,380 @@ class FNAFEffects:
         
         # Separate glitch timing from other effects
         self.glitch_timer = {
-            "last_time": time.time(),
+            "last_time": 0.0,
             "frame_start": 0,
             "active": False,
             "frame_count": 0,
-            "current_frame": None
+            "current_frame": None,
+            "forced": False  # Burst fired on request, runs even with the glitch effect off
         }
+        self.glitch_gray_source = None
+        self.glitch_gray_frame = None
+        self.glitch_resized_source = None
+        self.glitch_resized_frame = None
+        
+    def load_frames(self, size=None):
+        """Index glitch frames in static/frames; they are decoded on demand"""
+        paths = list_asset_files(FRAMES_DIR, ('.png', '.jpg'))
+        size = size or self.asset_resolution
+        store = AssetStore(
+            paths, size, self.decode_frame, self.glitch_cache_bytes,
+            self.asset_cache.lookup("frames", paths, size),
+            rng=self.asset_rng(), deterministic=self.effect_seed is not None
+        )
+        store.prefetch_next()
+        return store
+        
+    def asset_rng(self):
+        """Glitch frame selection source for a new store
         
-    def load_frames(self):
-        """Load glitch frames from static/frames directory"""
-        frames = []
-        for file in os.listdir(FRAMES_DIR):
-            if file.endswith(('.png', '.jpg')):
-                path = os.path.join(FRAMES_DIR, file)
-                img = cv2.imread(path)
-                if img is not None:
-                    frames.append(cv2.resize(img, (640, 480)))
-        return frames
-
-    def load_extra_images(self):
+        Each store gets its own generator (seeded like the effect chain), so a
+        loader or watcher thread never draws from the video thread's one.
+        """
+        return EffectRng(self.effect_seed)
+
+    def warm_frame_cache(self, store, progress_callback=None):
+        """Bring the on-disk frame cache up to date so later loads map instead of decode"""
+        self.asset_cache.load("frames", store.paths, store.size, 3, self.decode_frame, progress_callback)
+        store.attach_cache(self.asset_cache.lookup("frames", store.paths, store.size))
+
+    def load_extra_images(self, progress_callback=None, size=None):
         """Load extra images from static/extra directory"""
-        extras = []
-        for file in os.listdir(EXTRA_DIR):
-            if file.endswith('.png'):
-                path = os.path.join(EXTRA_DIR, file)
-                img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
-                if img is not None:
-                    extras.append(cv2.resize(img, (640, 480)))
-        return extras
+        paths = list_asset_files(EXTRA_DIR, ('.png',))
+        size = size or self.asset_resolution
+        return self.asset_cache.load("extra", paths, size, 4, self.decode_extra_image, progress_callback)
+
+    def decode_frame(self, path, size):
+        """Decode a glitch frame as BGR at the given size"""
+        img = cv2.imread(path)
+        if img is None:
+            return None
+        return cv2.resize(img, size)
+
+    def decode_extra_image(self, path, size):
+        """Decode an extra image as BGRA at the given size"""
+        img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+        if img is None:
+            return None
+        if img.ndim == 2:
+            img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGRA)
+        elif img.shape[2] == 3:
+            img = cv2.cvtColor(img, cv2.COLOR_BGR2BGRA)
+        return cv2.resize(img, size)
+
+    def load_assets(self, progress_callback=None, size=None):
+        """Load glitch frames and extra images, reporting (loaded, total) progress"""
+        with self.asset_lock:
+            size = size or self.pending_resolution or self.asset_resolution
+            try:
+                total = len(list_asset_files(FRAMES_DIR, ('.png', '.jpg'))) + len(list_asset_files(EXTRA_DIR, ('.png',)))
+                loaded = [0]
+                
+                def step():
+                    loaded[0] += 1
+                    if progress_callback:
+                        progress_callback(loaded[0], total)
+                        
+                extras = self.load_extra_images(step, size)
+                overlay_layer = OverlayLayer(extras, size)
+                frames = self.load_frames(size)
+                
+                # Swap in whole so the video thread never sees a partial load.
+                # Assets for the previous resolution are dropped here, so only the
+                # resolution in use stays resident.
+                previous = self.glitch_frames
+                self.glitch_frames = frames
+                self.extra_images = extras
+                self.overlay_layer = overlay_layer
+                if self.staged_assets and "frames" in self.staged_assets:
+                    self.staged_assets["frames"].close()
+                self.staged_assets = None
+                self.asset_resolution = size
+                previous.close()
+                
+                self.warm_frame_cache(frames, step)
+            finally:
+                # Cleared on failure too, so set_resolution() can retry this size
+                if self.pending_resolution == size:
+                    self.pending_resolution = None
+
+    def apply_asset_changes(self, directory, added, modified, removed):
+        """Incrementally reload one asset directory after files changed on disk"""
+        with self.asset_lock:
+            size = self.asset_resolution
+            staged = self.staged_assets or {}
+            
+            if directory == FRAMES_DIR:
+                # Keep every decoded frame whose file didn't change
+                paths = list_asset_files(FRAMES_DIR, ('.png', '.jpg'))
+                current = staged.get("frames", self.glitch_frames)
+                frames = current.updated(paths, set(added) | set(modified), self.asset_rng())
+                if current is not self.glitch_frames:
+                    current.close()  # Superseded before it was ever swapped in
+                self.warm_frame_cache(frames)
+                staged = dict(staged, frames=frames)
+            elif directory == EXTRA_DIR:
+                # The asset cache only decodes files whose mtime or size changed
+                extras = self.load_extra_images(size=size)
+                staged = dict(staged, extras=extras, overlay_layer=OverlayLayer(extras, size))
+            else:
+                return
+                
+            self.staged_assets = staged
+            
+    def swap_staged_assets(self):
+        """Swap in hot-reloaded assets; called between frames"""
+        # Never wait on a reload in progress: try again on the next frame
+        if not self.asset_lock.acquire(blocking=False):
+            return
+        try:
+            staged = self.staged_assets
+            if staged is None:
+                return
+            self.staged_assets = None
+            
+            if "frames" in staged:
+                previous = self.glitch_frames
+                self.glitch_frames = staged["frames"]
+                previous.close()
+            if "extras" in staged:
+                self.extra_images = staged["extras"]
+                self.overlay_layer = staged["overlay_layer"]
+        finally:
+            self.asset_lock.release()
+            
+    def start_hot_reload(self):
+        """Watch static/frames and static/extra and reload changed files in the background"""
+        ensure_directories()
+        self.watcher = AssetWatcher(
+            {FRAMES_DIR: ('.png', '.jpg'), EXTRA_DIR: ('.png',)},
+            self.apply_asset_changes
+        )
+        self.watcher.start()
+            
+    def set_resolution(self, width, height, progress_callback=None, done_callback=None):
+        """Prepare assets for a new pipeline resolution in the background"""
+        size = (int(width), int(height))
+        if size == self.asset_resolution or size == self.pending_resolution:
+            return
+        self.pending_resolution = size
+        AssetLoader(self, progress_callback, done_callback, size=size).start()
 
     def apply_effects(self, frame, settings=None):
         """Apply all enabled effects to frame"""
         if frame is None:
             return None
         
-        try:
-            # Apply glitch first to maintain timing
-            if self.effect_enabled["glitch"]:
-                frame = self.apply_glitch(frame)
+        self.clock.advance()
+        
+        if self.asset_source is not None:
+            # Shared, read-only assets: the primary pipeline loads and swaps them
+            self.glitch_frames = self.asset_source.glitch_frames
+            self.extra_images = self.asset_source.extra_images
+            self.overlay_layer = self.asset_source.overlay_layer
+        else:
+            if self.staged_assets is not None:
+                self.swap_staged_assets()
             
-            # Apply other effects
-            if self.effect_enabled["static"]:
-                frame = self.apply_static(frame, self.effect_intensities["static"])
+            # Camera started or changed mode: resize assets once, off the video thread
+            height, width = frame.shape[:2]
+            if (width, height) != self.asset_resolution:
+                self.set_resolution(width, height)
+        
+        if self.pending_changes:
+            self.apply_pending_changes()
+        
+        # Monochrome looks run the whole chain on one channel and tint at the end
+        mono = self.monochrome_enabled
+        if mono and frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        
+        # Each stage is isolated: a failure only skips that stage for this frame,
+        # and a stage that keeps failing is switched off
+        intensity = self.effect_intensities
+        run = self.stages.run
+        
+        # Apply glitch first to maintain timing
+        if self.effect_enabled["glitch"] or self.glitch_timer["forced"]:
+            frame = run("glitch", self.apply_glitch, frame)
+        
+        # Apply other effects
+        if self.effect_enabled["static"]:
+            frame = run("static", lambda f: self.apply_static(f, intensity["static"]), frame)
+        
+        if self.effect_enabled["tear"]:
+            frame = run("tear", lambda f: self.apply_tear(f, intensity["tear"]), frame)
             
-            if self.effect_enabled["tear"]:
-                frame = self.apply_tear(frame, self.effect_intensities["tear"])
-                
-            if self.effect_enabled["vhs"]:
-                frame = self.apply_vhs_effect(frame, self.effect_intensities["vhs"])
-                
-            if self.effect_enabled["noise"]:
-                frame = self.apply_noise(frame, self.effect_intensities["noise"])
-                
-            if self.effect_enabled["color_distortion"]:
-                frame = self.apply_color_distortion(frame, self.effect_intensities["color_distortion"])
-                
-            if self.effect_enabled["chromatic"]:
-                frame = self.apply_chromatic_aberration(frame, self.effect_intensities["chromatic"])
-                
-            if self.effect_enabled["tracking"]:
-                frame = self.apply_vhs_tracking(frame, self.effect_intensities["tracking"])
-                
-            if self.effect_enabled["artifacts"]:
-                frame = self.apply_digital_artifacts(frame, self.effect_intensities["artifacts"])
-                
-            return frame
+        if self.effect_enabled["vhs"]:
+            frame = run("vhs", lambda f: self.apply_vhs_effect(f, intensity["vhs"]), frame)
+            
+        if self.effect_enabled["noise"]:
+            frame = run("noise", lambda f: self.apply_noise(f, intensity["noise"]), frame)
+            
+        # Colour-only effects have nothing to do on a single channel
+        if self.effect_enabled["color_distortion"] and not mono:
+            frame = run("color_distortion", lambda f: self.apply_color_distortion(f, intensity["color_distortion"]), frame)
+            
+        if self.grade_lut is not None and not mono:
+            frame = run("color_grade", self.apply_color_grade, frame)
+            
+        if self.effect_enabled["chromatic"] and not mono:
+            frame = run("chromatic", lambda f: self.apply_chromatic_aberration(f, intensity["chromatic"]), frame)
+            
+        if self.effect_enabled["tracking"]:
+            frame = run("tracking", lambda f: self.apply_vhs_tracking(f, intensity["tracking"]), frame)
+            
+        if self.effect_enabled["artifacts"]:
+            frame = run("artifacts", lambda f: self.apply_digital_artifacts(f, intensity["artifacts"]), frame)
+            
+        if frame.ndim == 2:
+            frame = self.apply_tint(frame)
+            
+        # Overlay last so HUD frames and vignettes sit on top of the distortion
+        if self.effect_enabled["overlay"]:
+            frame = run("overlay", lambda f: self.overlay.apply(f, self.overlay_layer, intensity["overlay"]), frame)
             
-        except Exception as e:
-            print(f"Effect error: {str(e)}")
+        return frame
+
+    def queue_changes(self, changes):
+        """Apply a change set at the next frame boundary (safe from any thread)
+
+        changes uses the settings_snapshot() layout, plus "toggle": [effects] to
+        flip effects and "glitch": frames (0 for a random length) to fire a burst.
+        """
+        self.pending_changes.append(changes)
+
+    def apply_pending_changes(self):
+        """Apply every queued change set before any stage sees the frame"""
+        with self.changes_lock:
+            applied = self.drain_changes()
+        if self.settings_changed_callback:
+            self.settings_changed_callback(applied)
+            
+    def drain_changes(self):
+        applied = {"enabled": {}, "intensities": {}, "speeds": {}}
+        while self.pending_changes:
+            changes = self.pending_changes.popleft()
+            for effect, enabled in changes.get("enabled", {}).items():
+                self.toggle_effect(effect, bool(enabled))
+            for effect in changes.get("toggle", []):
+                self.toggle_effect(effect, not self.effect_enabled.get(effect, True))
+            for effect, value in changes.get("intensities", {}).items():
+                self.set_effect_intensity(effect, value)
+            for effect, value in changes.get("speeds", {}).items():
+                self.set_effect_speed(effect, value)
+            if "hud_enabled" in changes:
+                self.set_hud_enabled(bool(changes["hud_enabled"]))
+            if "monochrome_enabled" in changes:
+                self.set_monochrome(bool(changes["monochrome_enabled"]))
+            if "glitch" in changes:
+                self.trigger_glitch(changes["glitch"] or None)
+            
+            for effect in list(changes.get("enabled", {})) + list(changes.get("toggle", [])):
+                applied["enabled"][effect] = self.effect_enabled.get(effect)
+            for effect in changes.get("intensities", {}):
+                applied["intensities"][effect] = self.effect_intensities[effect]
+            for effect in changes.get("speeds", {}):
+                applied["speeds"][effect] = self.effect_speeds[effect]
+            for key in ("hud_enabled", "monochrome_enabled", "glitch", "preset"):
+                if key in changes:
+                    applied[key] = changes[key]
+        return applied
+
+    def settings_snapshot(self):
+        """Current effect settings, in the layout presets and queue_changes() use"""
+        return {
+            "enabled": dict(self.effect_enabled),
+            "intensities": dict(self.effect_intensities),
+            "speeds": dict(self.effect_speeds),
+            "hud_enabled": self.hud_enabled,
+            "monochrome_enabled": self.monochrome_enabled
+        }
+
+    def trigger_glitch(self, frames=None):
+        """Start a glitch sequence on this frame, whether or not the glitch effect is on"""
+        glitch_frame = self.glitch_frames.choose()
+        if glitch_frame is None:
+            return False
+        now = self.timers["glitch"].advance(self.effect_speeds["glitch"])
+        self.glitch_timer.update({
+            "active": True,
+            "forced": True,
+            "last_time": now,
+            "frame_start": now,
+            "current_frame": glitch_frame,
+            "frame_count": frames or self.rng.choice(DEFAULT_SETTINGS["glitch_frames_in_burst"])
+        })
+        return True
+
+    def disable_stage(self, name, error):
+        """Switch off a stage that keeps failing (called by the stage guard)"""
+        if name in self.effect_enabled:
+            self.effect_enabled[name] = False
+        elif name == "color_grade":
+            self.grade_lut = None
+        elif name == "hud":
+            self.hud_enabled = False
+        if self.stage_disabled_callback:
+            self.stage_disabled_callback(name, error)
+
+    def apply_tint(self, frame):
+        """Turn a single-channel frame back into BGR with the monochrome tint"""
+        tint = tuple(self.monochrome_tint)
+        if tint != self.tint_key:
+            self.tint_lut = channel_lut([c / 255.0 for c in tint], (0, 0, 0))
+            self.tint_key = tint
+        return cv2.LUT(cv2.merge([frame, frame, frame]), self.tint_lut)
+
+    def set_monochrome(self, enabled, tint=None):
+        """Switch the single-channel pipeline on or off"""
+        if tint is not None:
+            self.monochrome_tint = tuple(tint)
+        self.monochrome_enabled = enabled
+
+    def apply_hud(self, frame):
+        """Draw the camera HUD on top of the finished effect chain"""
+        if frame is None or not self.hud_enabled:
             return frame
+        return self.stages.run(
+            "hud", lambda f: self.hud.apply(f, self.hud_camera_label, self.hud_clock_format), frame
+        )
+
+    def random_layer(self, effect, shape, generate, key=None):
+        """Cached random layer for an effect, regenerated when its timer ticks
+        
+        key names any parameter baked into the layer (e.g. noise sigma), so a
+        change to it regenerates the layer at once, even at speed 0.
+        """
+        layer, layer_key = self.layers.get(effect, (None, None))
+        ticked = self.timers[effect].ticked(self.effect_speeds[effect])
+        if ticked or layer is None or layer.shape != shape or layer_key != key:
+            layer = generate(shape)
+            self.layers[effect] = (layer, key)
+        return layer
 
     def apply_vhs_effect(self, frame, intensity):
         """Apply VHS-style distortion effect with reduced intensity"""
         # Create noise pattern
-        noise = np.random.randint(0, 255, frame.shape, dtype='uint8')
-        noise = cv2.GaussianBlur(noise, (3, 3), 0)
+        noise = self.random_layer(
+            "vhs", frame.shape,
+            lambda shape: cv2.GaussianBlur(self.rng.uint8(shape, 0, 255), (3, 3), 0)
+        )
         
         # Add scanlines with reduced intensity
-        height, width = frame.shape[:2]
-        scanlines = np.zeros((height, width, 3), dtype='uint8')
-        for i in range(0, height, 2):
-            scanlines[i, :] = [25, 25, 25]  # Reduced scanline intensity
-        
-        # Apply color bleeding with reduced shift
-        channels = cv2.split(frame)
-        shifted_channels = []
-        for i, channel in enumerate(channels):
-            shift = int(2 * intensity * (i - 1))  # Reduced shift amount
-            shifted = np.roll(channel, shift, axis=1)
-            shifted_channels.append(shifted)
-        
-        frame = cv2.merge(shifted_channels)
+        scanlines = np.zeros(frame.shape, dtype='uint8')
+        scanlines[::2] = 25  # Reduced scanline intensity
+        
+        # Apply color bleeding with reduced shift (nothing to bleed on one channel)
+        if frame.ndim == 3:
+            channels = cv2.split(frame)
+            shifted_channels = []
+            for i, channel in enumerate(channels):
+                shift = int(2 * intensity * (i - 1))  # Reduced shift amount
+                shifted = np.roll(channel, shift, axis=1)
+                shifted_channels.append(shifted)
+            
+            frame = cv2.merge(shifted_channels)
         
         # Combine effects with reduced intensity
         frame = cv2.addWeighted(frame, 1 - intensity * 0.3, noise, intensity * 0.1, 0)
@@ -179,15 +541,25 @@ class FNAFEffects:
 
     def apply_vhs_tracking(self, frame, intensity):
         """Apply VHS tracking lines effect with intensity"""
-        if random.random() > intensity:  # Only apply sometimes based on intensity
-            return frame
-        
+        # The band (or its absence) holds until the tracking timer ticks
         height, width = frame.shape[:2]
-        y_pos = random.randint(0, height - 20)
-        tracking_height = random.randint(10, int(20 * intensity))
-        
+        if self.timers["tracking"].ticked(self.effect_speeds["tracking"]) or self.tracking_band is None:
+            if self.rng.random() > intensity:  # Only apply sometimes based on intensity
+                self.tracking_band = (0, 0, None)
+            else:
+                y_pos = self.rng.randint(0, height - 20)
+                tracking_height = self.rng.randint(10, max(10, int(20 * intensity)))
+                shape = (tracking_height, width) + frame.shape[2:]
+                self.tracking_band = (y_pos, tracking_height, self.rng.uint8(shape, 0, 255))
+                
+        y_pos, tracking_height, noise = self.tracking_band
+        if noise is None:
+            return frame
         tracking_area = frame[y_pos:y_pos + tracking_height, :]
-        noise = np.random.randint(0, 255, tracking_area.shape, dtype='uint8')
+        if noise.shape != tracking_area.shape:
+            # Resolution or channel count changed since the band was picked
+            self.tracking_band = None
+            return frame
         
         frame[y_pos:y_pos + tracking_height, :] = cv2.addWeighted(
             tracking_area, 1 - intensity, noise, intensity, 0
@@ -201,46 +573,81 @@ class FNAFEffects:
         channels = list(cv2.split(frame))
         
         # Choose a random channel to corrupt
-        corrupt_channel = random.randint(0, 2)
+        corrupt_channel = self.rng.randint(0, 2)
         
         # Apply random corruption
-        corruption = np.random.randint(-50, 50)
+        corruption = self.rng.randint(-50, 49)
         channels[corrupt_channel] = cv2.add(channels[corrupt_channel], corruption)
         
         return cv2.merge(channels)
 
     def apply_digital_artifacts(self, frame, intensity):
-        """Apply digital artifact glitches with intensity"""
-        height, width = frame.shape[:2]
+        """Apply digital artifact glitches with intensity
         
-        num_artifacts = int(random.randint(3, 8) * intensity)
-        for _ in range(num_artifacts):
-            x = random.randint(0, width - 50)
-            y = random.randint(0, height - 50)
-            w = random.randint(20, int(50 * intensity))
-            h = random.randint(10, int(30 * intensity))
+        All block rectangles for the frame are drawn in one batch. Blocks of the
+        same size and operation are gathered into one array, sorted or rolled
+        row-wise in a single call and scattered back through a window view, so
+        the per-block Python overhead is bounded by the number of size groups.
+        """
+        height, width = frame.shape[:2]
+        count = int(self.rng.randint(3, 8) * intensity * self.artifacts_density)
+        max_w = min(max(20, int(50 * intensity)), width)
+        max_h = min(max(10, int(30 * intensity)), height)
+        if count <= 0:
+            return frame
             
-            block = frame[y:y+h, x:x+w].copy()
+        # Block rectangles, always inside the frame whatever the intensity. Sizes
+        # snap to ARTIFACT_SIZE_STEP so blocks share groups at high densities.
+        step = ARTIFACT_SIZE_STEP
+        w = np.clip(self.rng.randints(min(20, max_w), max_w, count) // step * step, 1, max_w)
+        h = np.clip(self.rng.randints(min(10, max_h), max_h, count) // step * step, 1, max_h)
+        x = self.rng.randints(0, width - max_w, count)
+        y = self.rng.randints(0, height - max_h, count)
+        sort = self.rng.uniform(count) < 0.5
+        shift = (self.rng.randints(-10, 10, count) * intensity).astype(int)
+        
+        pixels = frame if frame.ndim == 3 else frame[:, :, None]
+        group_keys = (w * (max_h + 1) + h) * 2 + sort
+        order = np.argsort(group_keys, kind="stable")
+        keys = group_keys[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]).tolist()
+        for start, end in zip(starts, starts[1:] + [count]):
+            members = order[start:end]
+            first = members[0]
+            block_w, block_h = int(w[first]), int(h[first])
+            windows = np.lib.stride_tricks.sliding_window_view(pixels, (block_h, block_w), axis=(0, 1), writeable=True)
             
-            if random.random() < 0.5:
-                block.sort(axis=1)
+            # (blocks, channels, rows, columns) as one row per block line and channel
+            blocks = np.ascontiguousarray(windows[y[members], x[members]])
+            lines = blocks.reshape(-1, block_w)
+            if sort[first]:
+                lines.sort(axis=1, kind="stable")
             else:
-                block = np.roll(block, int(random.randint(-10, 10) * intensity), axis=1)
-            
-            frame[y:y+h, x:x+w] = block
+                # np.roll along each block's width: column j takes (j - shift) mod width
+                source = (np.arange(block_w) - shift[members][:, None]) % block_w
+                line_shift = np.repeat(source, blocks.shape[1] * block_h, axis=0)
+                offsets = np.arange(len(lines))[:, None] * block_w
+                blocks = lines.reshape(-1)[offsets + line_shift].reshape(blocks.shape)
+                
+            windows[y[members], x[members]] = blocks
         
         return frame
 
     def apply_color_distortion(self, frame, intensity):
         """Apply color distortion effect"""
-        # Split into channels
+        # New random offsets only when the colour distortion timer ticks
+        if self.timers["color_distortion"].ticked(self.effect_speeds["color_distortion"]):
+            self.color_offsets = (self.rng.randint(-20, 20), self.rng.randint(-20, 20), self.rng.randint(-20, 20))
+        
+        # Per-channel gain and offset as one lookup, rebuilt only when its inputs change
+        lut_key = (intensity, self.color_offsets)
+        if lut_key != self.color_lut_key:
+            gains = (1 + intensity * 0.2, 1 - intensity * 0.1, 1 + intensity * 0.15)
+            self.color_lut = channel_lut(gains, self.color_offsets)
+            self.color_lut_key = lut_key
+        frame = cv2.LUT(frame, self.color_lut)
         b, g, r = cv2.split(frame)
         
-        # Apply different intensity modifications to each channel
-        b = cv2.addWeighted(b, 1 + intensity * 0.2, np.zeros_like(b), 0, random.randint(-20, 20))
-        g = cv2.addWeighted(g, 1 - intensity * 0.1, np.zeros_like(g), 0, random.randint(-20, 20))
-        r = cv2.addWeighted(r, 1 + intensity * 0.15, np.zeros_like(r), 0, random.randint(-20, 20))
-        
         # Merge channels with slight offset
         shift = int(intensity * 4)
         rows, cols = frame.shape[:2]
@@ -255,14 +662,37 @@ class FNAFEffects:
         
         return cv2.merge([b, g, r])
 
+    def load_color_lut(self, path):
+        """Load a .cube 3D LUT for colour grading (empty path clears it)"""
+        grade_lut = CubeLut(path) if path else None
+        if grade_lut is not None:
+            # A new LUT gives the stage a fresh failure budget
+            self.stages.reset("color_grade")
+        self.grade_lut = grade_lut
+        
+    def set_hud_enabled(self, enabled):
+        """Show or hide the camera HUD"""
+        if enabled and not self.hud_enabled:
+            # Turning a stage back on gives it a fresh failure budget
+            self.stages.reset("hud")
+        self.hud_enabled = enabled
+
+    def apply_color_grade(self, frame):
+        """Apply the loaded 3D colour grading LUT"""
+        if self.grade_lut is None:
+            return frame
+        return self.grade_lut.apply(frame)
+
     def apply_static(self, frame, intensity):
         """Apply static noise effect similar to camera3"""
         if frame is None:
             return None
         
         # Use camera3's static implementation
-        static_overlay = np.random.randint(50, 150, (frame.shape[0], frame.shape[1]), dtype='uint8')
-        static_resized = cv2.cvtColor(static_overlay, cv2.COLOR_GRAY2BGR)
+        def generate(shape):
+            static_overlay = self.rng.uint8(shape[:2], 50, 150)
+            return static_overlay if len(shape) == 2 else cv2.cvtColor(static_overlay, cv2.COLOR_GRAY2BGR)
+        static_resized = self.random_layer("static", frame.shape, generate)
         
         # Reduced alpha for more subtle effect
         alpha = intensity * 0.3
@@ -270,74 +700,121 @@ class FNAFEffects:
 
     def apply_glitch(self, frame):
         """Apply glitch effect with independent timing"""
-        current_time = time.time()
+        # Glitch timing runs on the effect clock, scaled by the glitch speed
+        current_time = self.timers["glitch"].advance(self.effect_speeds["glitch"])
         
         # Check if we should start a new glitch sequence
         if not self.glitch_timer["active"]:
             if current_time - self.glitch_timer["last_time"] > self.effect_intensities["glitch_frequency"]:
-                if random.random() < self.effect_intensities["glitch"]:
+                if self.rng.random() < self.effect_intensities["glitch"]:
+                    # Never blocks: returns an already decoded frame or None
+                    glitch_frame = self.glitch_frames.choose()
+                    if glitch_frame is None:
+                        return frame
                     self.glitch_timer["active"] = True
                     self.glitch_timer["last_time"] = current_time
                     self.glitch_timer["frame_start"] = current_time
-                    self.glitch_timer["current_frame"] = random.choice(self.preloaded_images)
-                    self.glitch_timer["frame_count"] = random.choice(DEFAULT_SETTINGS["glitch_frames_in_burst"])
+                    self.glitch_timer["current_frame"] = glitch_frame
+                    self.glitch_timer["frame_count"] = self.rng.choice(DEFAULT_SETTINGS["glitch_frames_in_burst"])
         
         # If glitch is active, check if we should switch to next frame
         elif current_time - self.glitch_timer["frame_start"] >= self.effect_intensities["glitch_duration"]:
             if self.glitch_timer["frame_count"] > 1:
-                # Switch to next frame
-                self.glitch_timer["current_frame"] = random.choice(self.preloaded_images)
+                # Switch to next frame, keeping the current one if nothing else is decoded yet
+                next_frame = self.glitch_frames.choose()
+                if next_frame is not None:
+                    self.glitch_timer["current_frame"] = next_frame
                 self.glitch_timer["frame_start"] = current_time
                 self.glitch_timer["frame_count"] -= 1
             else:
                 # End glitch sequence
                 self.glitch_timer["active"] = False
+                self.glitch_timer["forced"] = False
                 self.glitch_timer["frame_count"] = 0
                 return frame
         
         # Apply current glitch frame if active
-        if self.glitch_timer["active"] and self.glitch_timer["current_frame"] is not None:
+        glitch_frame = self.glitch_timer["current_frame"]
+        if self.glitch_timer["active"] and glitch_frame is not None:
+            if self.asset_source is not None and glitch_frame.shape[:2] != frame.shape[:2]:
+                # Shared assets are prepared at the primary camera's resolution
+                glitch_frame = self.glitch_resized(glitch_frame, (frame.shape[1], frame.shape[0]))
+            if frame.ndim == 2:
+                glitch_frame = self.glitch_gray(glitch_frame)
+            if glitch_frame.shape != frame.shape:
+                # Assets for this resolution are still being prepared
+                return frame
             blend_alpha = DEFAULT_SETTINGS["glitch_blend_alpha"]
-            return cv2.addWeighted(frame, 1 - blend_alpha, self.glitch_timer["current_frame"], blend_alpha, 0)
+            return cv2.addWeighted(frame, 1 - blend_alpha, glitch_frame, blend_alpha, 0)
         
         return frame
 
+    def glitch_resized(self, glitch_frame, size):
+        """Copy of a shared glitch frame at this pipeline's size, resized once per frame change"""
+        source = self.glitch_resized_source
+        if source is None or source[0] is not glitch_frame or source[1] != size:
+            self.glitch_resized_frame = cv2.resize(glitch_frame, size, interpolation=cv2.INTER_AREA)
+            self.glitch_resized_source = (glitch_frame, size)
+        return self.glitch_resized_frame
+
+    def glitch_gray(self, glitch_frame):
+        """Single-channel copy of the current glitch frame, converted once per frame change"""
+        if self.glitch_gray_source is not glitch_frame:
+            self.glitch_gray_frame = cv2.cvtColor(glitch_frame, cv2.COLOR_BGR2GRAY)
+            self.glitch_gray_source = glitch_frame
+        return self.glitch_gray_frame
+
     def should_glitch(self, probability):
         """Determine if glitch should occur"""
         current_time = time.time()
         if current_time - self.last_glitch_time > 0.1:  # Minimum time between glitches
-            if random.random() < probability / 100:
+            if self.rng.random() < probability / 100:
                 self.last_glitch_time = current_time
                 return True
         return False
 
+    def apply_tear(self, frame, intensity):
+        """Apply screen tear on a share of frames set by intensity"""
+        if self.rng.random() > intensity:
+            return frame
+        return self.apply_screen_tear(frame)
+
     def apply_screen_tear(self, frame):
         """Apply screen tear effect"""
         height, width = frame.shape[:2]
-        tear_point = random.randint(0, height)
-        tear_height = random.randint(10, 50)
+        tear_point = self.rng.randint(0, height)
+        tear_height = self.rng.randint(10, 50)
         
         # Create tear effect
         if tear_point + tear_height < height:
             frame[tear_point:tear_point + tear_height] = np.roll(
                 frame[tear_point:tear_point + tear_height],
-                random.randint(-50, 50),
+                self.rng.randint(-50, 50),
                 axis=1
             )
         return frame
 
     def apply_noise(self, frame, intensity):
         """Apply noise effect"""
-        noise = np.random.normal(0, intensity * 30, frame.shape).astype('uint8')
+        sigma = round(intensity * 30, 3)
+        noise = self.random_layer(
+            "noise", frame.shape,
+            lambda shape: self.rng.normal_uint8(shape, sigma),
+            key=sigma
+        )
         return cv2.add(frame, noise)
 
     def reload_frames(self):
         """Reload glitch frames"""
-        self.preloaded_images = self.load_frames()
+        previous = self.glitch_frames
+        self.glitch_frames = self.load_frames()
+        previous.close()
+        self.warm_frame_cache(self.glitch_frames)
         
     def reload_extra_images(self):
         """Reload extra effect images"""
-        self.extra_images = self.load_extra_images()
+        extras = self.load_extra_images()
+        self.overlay_layer, self.extra_images = OverlayLayer(extras, self.asset_resolution), extras
 
     def set_effect_speed(self, effect, speed):
         """Set speed multiplier for an effect"""
@@ -351,6 +828,9 @@ class FNAFEffects:
     def toggle_effect(self, effect, enabled):
         """Toggle effect on/off"""
         if effect in self.effect_speeds:
+            if enabled and not self.effect_enabled[effect]:
+                # Turning a stage back on gives it a fresh failure budget
+                self.stages.reset(effect)
             self.effect_enabled[effect] = enabled
 
     def set_effect_intensity(self, effect, value):
@@ -0,0 +1,81 @@
+import logging
+import time
+from tracing import tracer
+from metrics import metrics
+
+logger = logging.getLogger("fnaf.effects")
+
+
+class StageGuard:
+    """Run effect stages in isolation so one failing stage can't take down the chain
+
+    A stage that raises returns its input frame unchanged. After failure_limit
+    consecutive failures it is disabled and on_disable(name, error) is called.
+    Errors are logged at most once per log_interval seconds per stage, with a
+    count of the ones suppressed in between.
+    """
+    def __init__(self, failure_limit=5, log_interval=5.0, on_disable=None):
+        self.failure_limit = failure_limit
+        self.log_interval = log_interval
+        self.on_disable = on_disable  # on_disable(name, error), called on the video thread
+        self.consecutive = {}
+        self.total = {}
+        self.suppressed = {}
+        self.last_log = {}
+        self.disabled = set()
+
+    def run(self, name, stage, frame):
+        """Apply stage(frame), or hand back frame if it fails"""
+        start = time.perf_counter()
+        try:
+            with tracer.span(name):
+                result = stage(frame)
+        except Exception as e:
+            metrics.stage_failures.inc(label_value=name)
+            self.failed(name, e)
+            return frame
+        metrics.stage_seconds.observe(time.perf_counter() - start, name)
+        if self.consecutive.get(name):
+            self.consecutive[name] = 0
+        return frame if result is None else result
+
+    def failed(self, name, error):
+        count = self.consecutive.get(name, 0) + 1
+        self.consecutive[name] = count
+        self.total[name] = self.total.get(name, 0) + 1
+        self.log(name, error, count)
+
+        if count >= self.failure_limit and name not in self.disabled:
+            self.disabled.add(name)
+            logger.error("stage=%s event=disabled consecutive_failures=%d error=%s",
+                         name, count, type(error).__name__)
+            if self.on_disable:
+                try:
+                    self.on_disable(name, error)
+                except Exception:
+                    logger.exception("stage=%s event=disable_callback_failed", name)
+
+    def log(self, name, error, count):
+        now = time.monotonic()
+        if now - self.last_log.get(name, float("-inf")) < self.log_interval:
+            self.suppressed[name] = self.suppressed.get(name, 0) + 1
+            return
+        logger.warning("stage=%s event=failure consecutive=%d total=%d suppressed=%d error=%s message=%s",
+                       name, count, self.total[name], self.suppressed.get(name, 0),
+                       type(error).__name__, str(error))
+        self.last_log[name] = now
+        self.suppressed[name] = 0
+
+    def reset(self, name=None):
+        """Forget failures, e.g. when the user turns a disabled stage back on"""
+        names = [name] if name else list(self.consecutive)
+        for key in names:
+            self.consecutive[key] = 0
+            self.disabled.discard(key)
+
+    def stats(self):
+        return {
+            "consecutive": dict(self.consecutive),
+            "total": dict(self.total),
+            "disabled": sorted(self.disabled)
+        }
@@ -1,15 +1,21 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog
 import customtkinter as ctk
-from PIL import Image, ImageTk
 import os
-from config import THEMES, FONTS_DIR, FRAMES_DIR, DEFAULT_SETTINGS, APP_INFO, STATIC_DIR
-import cv2
+from config import THEMES, FONTS_DIR, DEFAULT_SETTINGS, APP_INFO, STATIC_DIR, RECORDINGS_DIR, CAPTURES_DIR
 from threading import Thread
 import random
 import yaml
 import time
-import numpy as np
+from animations import AnimationScheduler
+from assets import AssetLoader
+from multicam import MultiCameraManager, MAX_CAMERAS
+from tracing import tracer
+from presets import save_preset
+from lazy_import import lazy_import
+
+cv2 = lazy_import("cv2")
+Image = lazy_import("PIL.Image")
 
 class ModernFNAFGui:
     def __init__(self, root, camera_manager=None, effects_manager=None, animations=None):
@@ -22,9 +28,17 @@ class ModernFNAFGui:
         self.sliders = {}
         self.labels = {}
         
+        # Preview presenter state
+        self.pending_preview = None
+        self.preview_scheduled = False
+        self.preview_present_time = 0.0
+        
         # Set managers
         self.camera_manager = camera_manager
         self.effects_manager = effects_manager
+        if effects_manager:
+            effects_manager.stage_disabled_callback = self.on_stage_disabled
+            effects_manager.settings_changed_callback = self.on_settings_changed
         self.animations = animations
         
         # Create main frame
@@ -199,7 +213,8 @@ class ModernFNAFGui:
             ("Color Distortion", "color_distortion"),
             ("Chromatic Aberration", "chromatic"),
             ("VHS Tracking", "tracking"),
-            ("Digital Artifacts", "artifacts")
+            ("Digital Artifacts", "artifacts"),
+            ("Camera Overlay", "overlay")
         ]
 
         # Create effect groups in left column
@@ -248,6 +263,7 @@ class ModernFNAFGui:
         # Intensity percentage label
         percent_label = ctk.CTkLabel(intensity_frame, text="0%")
         percent_label.pack(side="left", padx=2)
+        self.labels[f"{key}_intensity"] = percent_label
         
         # Speed slider
         speed_frame = ctk.CTkFrame(controls)
@@ -267,6 +283,7 @@ class ModernFNAFGui:
         # Speed multiplier label
         speed_label = ctk.CTkLabel(speed_frame, text="1.0x")
         speed_label.pack(side="left", padx=2)
+        self.labels[f"{key}_speed"] = speed_label
         
         # Configure slider commands
         intensity.configure(command=lambda v: self.update_effect_intensity(key, v/100, percent_label))
@@ -460,13 +477,25 @@ class ModernFNAFGui:
 
     def reload_effects(self):
         """Reload all effects and frames"""
-        try:
-            if hasattr(self, 'effects_manager'):
-                self.effects_manager.reload_frames()
-                self.effects_manager.reload_extra_images()
-            self.update_status("Effects reloaded successfully")
-        except Exception as e:
-            self.update_status(f"Error reloading effects: {str(e)}")
+        self.load_effects_async("Reloading effects", "Effects reloaded successfully")
+        
+    def load_effects_async(self, action="Loading effects", done_message="Effects loaded"):
+        """Load effect assets on a background thread with progress in the status bar"""
+        if not self.effects_manager:
+            return
+            
+        def progress(loaded, total):
+            self.root.after(0, lambda: self.update_status(f"{action}... {loaded}/{total}"))
+            
+        def done(error):
+            if error:
+                message = f"Error reloading effects: {str(error)}"
+            else:
+                message = done_message
+            self.root.after(0, lambda: self.update_status(message))
+            
+        self.update_status(f"{action}...")
+        AssetLoader(self.effects_manager, progress, done).start()
 
     def reset_settings(self):
         """Reset all settings to default"""
@@ -484,10 +513,16 @@ class ModernFNAFGui:
 
     def save_preset(self):
         """Save current settings as a preset"""
-        # Implementation for saving presets
-        settings = self.get_current_settings()
-        # TODO: Add preset saving functionality
-        self.update_status("Preset saved")
+        if not self.effects_manager:
+            return
+        name = ctk.CTkInputDialog(text="Preset name:", title="Save Preset").get_input()
+        if not name:
+            return
+        try:
+            save_preset(name, self.effects_manager.settings_snapshot())
+            self.update_status(f"Preset '{name.strip()}' saved")
+        except (OSError, ValueError) as e:
+            self.update_status(f"Error saving preset: {str(e)}")
 
     def create_camera_controls(self):
         """Create camera control panel"""
@@ -522,11 +557,22 @@ class ModernFNAFGui:
         fps_spinbox = ctk.CTkEntry(
             combo_frame,
             width=50,
-            placeholder_text="30"
+            placeholder_text=str(DEFAULT_SETTINGS["fps"])
         )
         fps_spinbox.pack(side="left", padx=5)
-        fps_spinbox.insert(0, "30")
-        fps_spinbox.bind('<Return>', lambda e: self.camera_manager.set_fps(int(fps_spinbox.get())))
+        fps_spinbox.insert(0, str(DEFAULT_SETTINGS["fps"]))
+        fps_spinbox.bind('<Return>', lambda e: self.update_fps(int(fps_spinbox.get())))
+        
+        # Resolution the effects run at for the virtual camera
+        ctk.CTkLabel(combo_frame, text="Scale:").pack(side="left", padx=(10, 0))
+        self.scale_menu = ctk.CTkOptionMenu(
+            combo_frame,
+            values=["100%", "75%", "50%", "33%"],
+            width=80,
+            command=self.change_processing_scale
+        )
+        self.scale_menu.pack(side="left", padx=5)
+        self.scale_menu.set(f"{int(DEFAULT_SETTINGS['output_scale'] * 100)}%")
         
         # Center-right: Control buttons
         self.start_btn = ctk.CTkButton(
@@ -551,6 +597,20 @@ class ModernFNAFGui:
         )
         self.capture_btn.pack(side="left", padx=5)
         
+        self.record_btn = ctk.CTkButton(
+            combo_frame,
+            text="⏺ Record",
+            command=self.toggle_recording
+        )
+        self.record_btn.pack(side="left", padx=5)
+        
+        self.replay_btn = ctk.CTkButton(
+            combo_frame,
+            text=f"⏪ Save Last {DEFAULT_SETTINGS['replay_seconds']}s",
+            command=self.save_replay
+        )
+        self.replay_btn.pack(side="left", padx=5)
+        
         # Right side: Virtual output and reload effects
         self.virtual_toggle = ctk.CTkSwitch(
             combo_frame,
@@ -560,12 +620,44 @@ class ModernFNAFGui:
         self.virtual_toggle.pack(side="right", padx=5)
         self.virtual_toggle.select()
         
+        self.hud_toggle = ctk.CTkSwitch(
+            combo_frame,
+            text="Camera HUD",
+            command=self.toggle_hud
+        )
+        self.hud_toggle.pack(side="right", padx=5)
+        if DEFAULT_SETTINGS["hud_enabled"]:
+            self.hud_toggle.select()
+        
+        self.mono_toggle = ctk.CTkSwitch(
+            combo_frame,
+            text="Monochrome",
+            command=self.toggle_monochrome
+        )
+        self.mono_toggle.pack(side="right", padx=5)
+        if DEFAULT_SETTINGS["monochrome_enabled"]:
+            self.mono_toggle.select()
+        
         self.reload_btn = ctk.CTkButton(
             combo_frame,
             text="↻ Reload Effects",
             command=self.reload_effects
         )
         self.reload_btn.pack(side="right", padx=5)
+        
+        self.lut_btn = ctk.CTkButton(
+            combo_frame,
+            text="🎨 Load LUT",
+            command=self.load_color_lut
+        )
+        self.lut_btn.pack(side="right", padx=5)
+        
+        self.multicam_btn = ctk.CTkButton(
+            combo_frame,
+            text="🎥 Multi-Cam",
+            command=self.show_multicam_window
+        )
+        self.multicam_btn.pack(side="right", padx=5)
 
     def create_tooltip(self, widget, text):
         """Create a cursor-following tooltip for a widget"""
@@ -601,17 +693,42 @@ class ModernFNAFGui:
         widget.bind("<Leave>", hide_tooltip)
 
     def update_preview(self, frame):
-        """Update preview with frame"""
+        """Update preview with an RGB frame from the preview sink"""
         if frame is None or not hasattr(self, 'preview_label'):
             return
         
+        # Called from the camera thread: keep only the newest frame and let
+        # the Tk thread present it once it gets to it
+        self.pending_preview = frame
+        if not self.preview_scheduled:
+            self.preview_scheduled = True
+            self.root.after(0, self.present_preview)
+            
+    def preview_backlogged(self):
+        """Check whether the main loop is behind the preview presenter"""
+        return self.preview_scheduled or self.preview_present_time > 0.025
+        
+    def present_preview(self):
+        """Draw the newest pending frame on the Tk thread"""
+        self.preview_scheduled = False
+        frame = self.pending_preview
+        self.pending_preview = None
+        if frame is None:
+            return
+            
+        start = time.perf_counter()
+        self.show_frame(self.preview_label, frame)
+        self.preview_present_time = time.perf_counter() - start
+        
+    def show_frame(self, label, frame):
+        """Fit an RGB frame into a label, keeping its aspect ratio"""
         try:
-            # Convert frame to RGB
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            # The preview sinks already deliver RGB at the preview size
+            frame_rgb = frame
             
             # Get current preview dimensions
-            width = self.preview_label.winfo_width()
-            height = self.preview_label.winfo_height()
+            width = label.winfo_width()
+            height = label.winfo_height()
             
             if width > 1 and height > 1:  # Ensure valid dimensions
                 # Calculate aspect ratio preserving resize
@@ -638,8 +755,8 @@ class ModernFNAFGui:
                 )
                 
                 # Update preview
-                self.preview_label.configure(image=ctk_image)
-                self.preview_label.image = ctk_image  # Keep reference
+                label.configure(image=ctk_image)
+                label.image = ctk_image  # Keep reference
                 
         except Exception as e:
             print(f"Preview error: {str(e)}")
@@ -717,8 +834,23 @@ class ModernFNAFGui:
 
     def refresh_cameras(self):
         """Refresh available cameras list"""
+        # Probing cameras can take seconds, so do it off the Tk thread
+        self.update_status("Detecting cameras...")
+        
+        def probe():
+            try:
+                cameras = self.camera_manager.get_available_cameras()
+            except Exception as e:
+                print(f"Camera refresh error: {str(e)}")
+                self.root.after(0, lambda: self.update_status("Error refreshing cameras"))
+                return
+            self.root.after(0, lambda: self.apply_camera_list(cameras))
+            
+        Thread(target=probe, daemon=True).start()
+        
+    def apply_camera_list(self, cameras):
+        """Show detected cameras in the camera dropdown"""
         try:
-            cameras = self.camera_manager.get_available_cameras()
             camera_list = [f"Camera {index}" for index, name in cameras]
             
             if not camera_list:
@@ -748,6 +880,10 @@ class ModernFNAFGui:
                 
                 # Start camera
                 if self.camera_manager.start_camera(camera_index):
+                    # Prepare glitch assets at the processing resolution before frames arrive
+                    if self.effects_manager and self.camera_manager.frame_size:
+                        self.effects_manager.set_resolution(*self.camera_manager.processing_size())
+                        
                     # Start processing thread
                     self.process_thread = Thread(
                         target=self.process_camera_feed,
@@ -775,12 +911,88 @@ class ModernFNAFGui:
 
     def capture_frame(self):
         """Capture and save the current frame"""
+        def saved(filename, error):
+            # Runs on a snapshot pool thread: hand the result to the Tk thread
+            if error is None:
+                message = f"Frame saved as {filename}"
+            else:
+                message = f"Capture error: {str(error)}"
+            self.root.after(0, lambda: self.update_status(message))
+            
         try:
-            filename = self.camera_manager.capture_frame(FRAMES_DIR)
-            self.update_status(f"Frame saved as {filename}")
+            settings = self.get_current_settings()
+            filename = self.camera_manager.capture_frame(
+                CAPTURES_DIR, saved,
+                settings.get("snapshot_format"), settings.get("snapshot_jpeg_quality")
+            )
+            if filename is None:
+                self.update_status("No processed frame to capture yet")
+            else:
+                self.update_status(f"Saving {filename}...")
         except Exception as e:
             self.update_status(f"Capture error: {str(e)}")
 
+    def toggle_recording(self):
+        """Start or stop recording the processed stream"""
+        if not hasattr(self, 'camera_manager'):
+            return
+        if self.camera_manager.recorder is not None:
+            self.scheduler.remove("recording_status")
+            self.camera_manager.stop_recording()
+            self.record_btn.configure(text="⏺ Record")
+            self.update_status("Recording stopped")
+            return
+            
+        if not self.camera_manager.running:
+            self.update_status("Start a camera before recording")
+            return
+        try:
+            timestamp = time.strftime("%Y%m%d-%H%M%S")
+            path = os.path.join(RECORDINGS_DIR, f"recording_{timestamp}.mp4")
+            self.camera_manager.start_recording(path, self.get_current_settings())
+            self.record_btn.configure(text="⏹ Stop Rec")
+            self.scheduler.add("recording_status", self.show_recording_status, 1000)
+            self.update_status(f"Recording to {os.path.basename(path)}")
+        except Exception as e:
+            self.update_status(f"Recording error: {str(e)}")
+            
+    def save_replay(self):
+        """Save the replay buffer to a clip without blocking the UI"""
+        if not hasattr(self, 'camera_manager'):
+            return
+            
+        def saved(path, error):
+            # Runs on the clip writer thread: hand the result to the Tk thread
+            if error is None:
+                message = f"Replay saved as {os.path.basename(path)}"
+            else:
+                message = f"Replay error: {str(error)}"
+            self.root.after(0, lambda: self.update_status(message))
+            
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(RECORDINGS_DIR, f"replay_{timestamp}.mp4")
+        if self.camera_manager.save_replay(path, saved):
+            self.update_status(f"Saving replay ({self.camera_manager.replay.duration():.0f}s)...")
+        else:
+            self.update_status("Replay buffer is empty")
+            
+    def show_recording_status(self):
+        """Show encoder throughput and backlog while recording"""
+        recorder = self.camera_manager.recorder
+        if recorder is None:
+            self.scheduler.remove("recording_status")
+            self.record_btn.configure(text="⏺ Record")
+            return
+        if recorder.error is not None:
+            self.toggle_recording()
+            self.update_status(f"Recording error: {str(recorder.error)}")
+            return
+        stats = recorder.stats()
+        self.update_status(
+            f"● REC {stats['encode_fps']:.1f} fps | queue {stats['queue_depth']}/{stats['queue_size']} "
+            f"| dropped {stats['dropped']}"
+        )
+        
     def process_camera_feed(self):
         """Process camera feed and update preview"""
         try:
@@ -789,8 +1001,7 @@ class ModernFNAFGui:
                     self.effects_manager, 
                     self.get_current_settings()
                 ):
-                    if frame is not None:
-                        self.update_preview(frame)
+                    # The preview arrives through the camera's preview sink
                     if not self.camera_manager.running:
                         break
         except Exception as e:
@@ -826,6 +1037,11 @@ class ModernFNAFGui:
         self.animation_frame = 0
         self.animation_running = True
         
+        # One shared tick for every GUI animation, backing off while the preview is queued
+        self.scheduler = AnimationScheduler(self.root, busy_check=self.preview_backlogged)
+        if self.animations:
+            self.animations.attach_scheduler(self.scheduler)
+        
         def animate_title():
             """Animate the title with a glitch effect"""
             if hasattr(self, 'status_label') and self.animation_running:
@@ -835,21 +1051,23 @@ class ModernFNAFGui:
                 if random.random() < 0.1:  # 10% chance to change color
                     title_color = random.choice(colors)
                     self.status_label.configure(text_color=title_color)
-                
-                # Reset to theme color after brief delay
-                self.root.after(100, lambda: self.status_label.configure(
-                    text_color=THEMES[self.current_theme]["accent"]
-                ))
-                
-                # Continue animation
-                self.root.after(50, animate_title)
+                    
+                    # Reset to theme color after brief delay
+                    self.scheduler.call_later("status_glitch_reset", 100, lambda: self.status_label.configure(
+                        text_color=THEMES[self.current_theme]["accent"]
+                    ))
         
         # Start animation loop
-        animate_title()
+        self.scheduler.add("status_glitch", animate_title, 50)
+        self.scheduler.add("latency_summary", self.show_latency_summary, 1000)
+        self.scheduler.add("pacing_stats", self.show_pacing_stats, 1000)
+        self.scheduler.add("idle_control_changes", self.apply_idle_changes, 50)
+        self.scheduler.start()
 
         def cleanup():
             """Stop animations when window closes"""
             self.animation_running = False
+            self.scheduler.stop()
             self.root.destroy()
         
         # Bind cleanup to window close
@@ -858,7 +1076,63 @@ class ModernFNAFGui:
     def set_effects_manager(self, effects_manager):
         """Set the effects manager instance"""
         self.effects_manager = effects_manager
-
+        effects_manager.stage_disabled_callback = self.on_stage_disabled
+        effects_manager.settings_changed_callback = self.on_settings_changed
+        
+    def on_stage_disabled(self, name, error):
+        """An effect stage kept failing and was switched off (called on the video thread)"""
+        def show():
+            toggle = self.hud_toggle if name == "hud" else self.toggles.get(name)
+            if toggle is not None:
+                toggle.deselect()
+            self.update_status(f"⚠ {name.replace('_', ' ').title()} disabled after repeated errors: {str(error)}")
+        self.root.after(0, show)
+
+    def apply_idle_changes(self):
+        """Apply control API changes that no running camera will pick up at a frame boundary"""
+        if self.effects_manager and self.effects_manager.pending_changes:
+            if not (self.camera_manager and self.camera_manager.running):
+                self.effects_manager.apply_pending_changes()
+        multicam = getattr(self, 'multicam', None)
+        if multicam is not None:
+            for pipeline in multicam.pipelines:
+                if pipeline.effects.pending_changes and not pipeline.camera.running:
+                    pipeline.effects.apply_pending_changes()
+        
+    def on_settings_changed(self, applied):
+        """Control API changes were applied to the effects (called on the video thread)"""
+        self.root.after(0, lambda: self.sync_effect_controls(applied))
+        
+    def sync_effect_controls(self, applied):
+        """Move toggles and sliders to match settings changed outside the GUI"""
+        for effect, enabled in applied.get("enabled", {}).items():
+            self.set_switch(self.toggles.get(effect), enabled)
+        for effect, value in applied.get("intensities", {}).items():
+            if f"{effect}_intensity" in self.sliders:
+                self.sliders[f"{effect}_intensity"].set(value * 100)
+            if f"{effect}_intensity" in self.labels:
+                self.labels[f"{effect}_intensity"].configure(text=f"{int(value * 100)}%")
+        for effect, value in applied.get("speeds", {}).items():
+            if f"{effect}_speed" in self.sliders:
+                self.sliders[f"{effect}_speed"].set(value * 100)
+            if f"{effect}_speed" in self.labels:
+                self.labels[f"{effect}_speed"].configure(text=f"{value:.1f}x")
+        if "hud_enabled" in applied:
+            self.set_switch(getattr(self, 'hud_toggle', None), applied["hud_enabled"])
+        if "monochrome_enabled" in applied:
+            self.set_switch(getattr(self, 'mono_toggle', None), applied["monochrome_enabled"])
+        if "preset" in applied:
+            self.update_status(f"Preset '{applied['preset']}' applied")
+        
+    def set_switch(self, switch, on):
+        """Set a switch without running its command"""
+        if switch is None:
+            return
+        if on:
+            switch.select()
+        else:
+            switch.deselect()
+        
     def load_tips(self):
         """Load tooltips from YAML file"""
         try:
@@ -1037,11 +1311,46 @@ class ModernFNAFGui:
         except Exception as e:
             print(f"Camera selection error: {str(e)}")
 
+    def update_fps(self, fps):
+        """Change the capture and virtual camera output rate"""
+        if hasattr(self, 'camera_manager'):
+            self.camera_manager.set_fps(fps)
+            
     def toggle_virtual_camera(self):
         """Toggle virtual camera output"""
         if hasattr(self, 'camera_manager'):
             self.camera_manager.virtual_camera_enabled = self.virtual_toggle.get()
 
+    def load_color_lut(self):
+        """Pick a .cube file and use it for colour grading"""
+        path = filedialog.askopenfilename(
+            title="Load colour LUT",
+            filetypes=[("Cube LUT", "*.cube"), ("All files", "*.*")]
+        )
+        if not path or not self.effects_manager:
+            return
+        try:
+            self.effects_manager.load_color_lut(path)
+            self.update_status(f"Colour LUT loaded: {os.path.basename(path)}")
+        except Exception as e:
+            self.update_status(f"Error loading LUT: {str(e)}")
+
+    def change_processing_scale(self, selection):
+        """Run the effect chain at a fraction of the capture resolution"""
+        scale = int(selection.rstrip("%")) / 100.0
+        self.camera_manager.set_processing_scale(output_scale=scale)
+        self.update_status(f"Effects processed at {selection} of capture size")
+
+    def toggle_monochrome(self):
+        """Toggle the single-channel (greyscale / night vision) pipeline"""
+        if self.effects_manager:
+            self.effects_manager.set_monochrome(bool(self.mono_toggle.get()))
+
+    def toggle_hud(self):
+        """Toggle the camera HUD overlay"""
+        if self.effects_manager:
+            self.effects_manager.set_hud_enabled(bool(self.hud_toggle.get()))
+
     def create_status_bar(self):
         """Create status bar at bottom of window"""
         status_frame = ctk.CTkFrame(self.main_frame)
@@ -1053,6 +1362,22 @@ class ModernFNAFGui:
             font=("Arial", 12)
         )
         self.status_label.pack(side="left", padx=10)
+        
+        # Rolling capture-to-send latency, so regressions show up while streaming
+        self.latency_label = ctk.CTkLabel(
+            status_frame,
+            text="",
+            font=("Arial", 12)
+        )
+        self.latency_label.pack(side="right", padx=10)
+        
+        # Virtual camera pacing: deadline lateness and repeated/dropped/skipped frames
+        self.pacing_label = ctk.CTkLabel(
+            status_frame,
+            text="",
+            font=("Arial", 12)
+        )
+        self.pacing_label.pack(side="right", padx=10)
 
     def create_menu(self):
         """Create application menu bar"""
@@ -1064,9 +1389,54 @@ class ModernFNAFGui:
         app_menu = tk.Menu(self.menubar, tearoff=0)
         self.menubar.add_cascade(label="App", menu=app_menu)
         app_menu.add_command(label="Settings", command=self.show_settings_window)
+        app_menu.add_command(label="Export Trace...", command=self.export_trace)
         app_menu.add_separator()
         app_menu.add_command(label="Exit", command=self.root.quit)
 
+    def show_latency_summary(self):
+        """Show capture-to-send latency and the slowest stage in the status bar"""
+        summary = tracer.summary()
+        latency = summary["latency"]
+        if not latency["p50"] or not hasattr(self, 'latency_label'):
+            return
+        stages = {name: stats for name, stats in summary["spans"].items() if name not in ("capture", "send")}
+        slowest = max(stages, key=lambda name: stages[name]["p95"], default=None)
+        text = f"Latency p50 {latency['p50']:.0f} ms / p95 {latency['p95']:.0f} ms"
+        if slowest:
+            text += f" | slowest: {slowest} {stages[slowest]['p95']:.1f} ms"
+        self.latency_label.configure(text=text)
+        
+    def show_pacing_stats(self):
+        """Show the virtual camera's output jitter and frame repeats/drops in the status bar"""
+        if not hasattr(self, 'pacing_label'):
+            return
+        pacer = self.camera_manager.pacer if self.camera_manager else None
+        if pacer is None:
+            self.pacing_label.configure(text="")
+            return
+        stats = pacer.stats()
+        if stats["jitter_p95"] is None:
+            return
+        self.pacing_label.configure(
+            text=f"Output jitter p95 {stats['jitter_p95']} | repeated {stats['repeated']}"
+                 f" | dropped {stats['dropped']} | skipped {stats['skipped_deadlines']}"
+        )
+        
+    def export_trace(self):
+        """Save recent frame spans as a Chrome trace (.json) or CSV"""
+        path = filedialog.asksaveasfilename(
+            title="Export trace",
+            defaultextension=".json",
+            filetypes=[("Chrome trace", "*.json"), ("CSV", "*.csv")]
+        )
+        if not path:
+            return
+        try:
+            frames = tracer.export(path)
+            self.update_status(f"Trace of {frames} frames saved to {os.path.basename(path)}")
+        except Exception as e:
+            self.update_status(f"Trace export error: {str(e)}")
+            
     def show_camera_settings(self):
         """Show camera settings window"""
         settings_window = ctk.CTkToplevel(self.root)
@@ -1090,6 +1460,129 @@ class ModernFNAFGui:
         fps_label = ctk.CTkLabel(fps_frame, text=f"{self.camera_manager.fps} FPS")
         fps_label.pack(side="right", padx=5)
 
+    def show_multicam_window(self):
+        """Run 2-4 cameras at once with a grid preview and per-camera stats"""
+        if getattr(self, 'multicam_window', None) is not None and self.multicam_window.winfo_exists():
+            self.multicam_window.focus()
+            return
+        if getattr(self, 'multicam', None) is None:
+            self.multicam = MultiCameraManager(self.effects_manager)
+        self.multicam_pending = {}
+        self.multicam_scheduled = False
+        
+        window = ctk.CTkToplevel(self.root)
+        window.title("Multi-Camera")
+        window.geometry("960x640")
+        self.multicam_window = window
+        
+        controls = ctk.CTkFrame(window)
+        controls.pack(fill="x", padx=10, pady=5)
+        ctk.CTkLabel(controls, text="Cameras:").pack(side="left", padx=5)
+        cameras_entry = ctk.CTkEntry(controls, width=120, placeholder_text="0,1")
+        cameras_entry.pack(side="left", padx=5)
+        # One virtual camera device per camera, in the same order; leave a slot
+        # empty to run that camera with preview only
+        ctk.CTkLabel(controls, text="Virtual devices:").pack(side="left", padx=5)
+        devices_entry = ctk.CTkEntry(controls, width=260, placeholder_text="e.g. ,Unity Video Capture")
+        devices_entry.pack(side="left", padx=5)
+        ctk.CTkButton(
+            controls,
+            text="▶ Start",
+            command=lambda: self.start_multicam(cameras_entry.get(), devices_entry.get())
+        ).pack(side="left", padx=5)
+        ctk.CTkButton(
+            controls,
+            text="◼ Stop",
+            command=self.stop_multicam
+        ).pack(side="left", padx=5)
+        
+        # 2x2 grid of preview tiles, each with a stats line underneath
+        grid = ctk.CTkFrame(window)
+        grid.pack(fill="both", expand=True, padx=10, pady=5)
+        self.multicam_tiles = []
+        for slot in range(MAX_CAMERAS):
+            grid.grid_rowconfigure(slot // 2, weight=1)
+            grid.grid_columnconfigure(slot % 2, weight=1)
+            tile = ctk.CTkFrame(grid)
+            tile.grid(row=slot // 2, column=slot % 2, sticky="nsew", padx=4, pady=4)
+            image_label = ctk.CTkLabel(tile, text="No camera")
+            image_label.pack(fill="both", expand=True)
+            stats_label = ctk.CTkLabel(tile, text="")
+            stats_label.pack(fill="x")
+            self.multicam_tiles.append((image_label, stats_label))
+            
+        def close():
+            self.stop_multicam()
+            self.multicam_window = None
+            window.destroy()
+        window.protocol("WM_DELETE_WINDOW", close)
+        
+    def start_multicam(self, selection, devices=""):
+        """Start one pipeline per camera index in a comma-separated list
+        
+        devices is a matching comma-separated list of virtual camera device
+        names; a camera without one runs with preview only.
+        """
+        try:
+            indices = [int(part) for part in selection.replace(" ", "").split(",") if part]
+        except ValueError:
+            self.update_status("Enter camera numbers separated by commas, e.g. 0,1")
+            return
+        names = [name.strip() for name in devices.split(",")] if devices.strip() else []
+        names += [""] * (len(indices) - len(names))
+        self.stop_multicam()
+        self.multicam.pipelines.clear()
+        try:
+            for slot, index in enumerate(indices):
+                pipeline = self.multicam.add_camera(index, names[slot] or None)
+                pipeline.camera.set_preview_callback(lambda frame, slot=slot: self.update_tile(slot, frame))
+        except ValueError as e:
+            self.update_status(str(e))
+            return
+            
+        failed = self.multicam.start_all()
+        if failed:
+            self.update_status(f"Could not open camera(s): {', '.join(map(str, failed))}")
+        else:
+            self.update_status(f"Running {len(indices)} cameras")
+        self.scheduler.add("multicam_stats", self.show_multicam_stats, 1000)
+        
+    def camera_effects(self, camera_index):
+        """Effect settings of a running multi-camera pipeline (used by the control API)"""
+        if getattr(self, 'multicam', None) is None:
+            raise ValueError(f"No camera pipeline {camera_index}")
+        return self.multicam.effects_for(camera_index)
+        
+    def stop_multicam(self):
+        if getattr(self, 'multicam', None) is not None:
+            self.multicam.stop_all()
+        self.scheduler.remove("multicam_stats")
+        
+    def update_tile(self, slot, frame):
+        """Queue a grid tile frame from a camera thread; newest frame wins"""
+        self.multicam_pending[slot] = frame
+        if not self.multicam_scheduled:
+            self.multicam_scheduled = True
+            self.root.after(0, self.present_tiles)
+            
+    def present_tiles(self):
+        self.multicam_scheduled = False
+        pending, self.multicam_pending = self.multicam_pending, {}
+        if getattr(self, 'multicam_window', None) is None:
+            return
+        for slot, frame in pending.items():
+            self.show_frame(self.multicam_tiles[slot][0], frame)
+            
+    def show_multicam_stats(self):
+        if getattr(self, 'multicam_window', None) is None:
+            return
+        for slot, stats in enumerate(self.multicam.stats()):
+            state = "" if stats["running"] else " (stopped)"
+            output = stats["virtual_device"] or "preview only"
+            self.multicam_tiles[slot][1].configure(
+                text=f"Camera {stats['camera']}{state} → {output} | {stats['fps']:.1f} FPS | CPU {stats['cpu_percent']:.0f}%"
+            )
+        
     def show_effect_settings(self):
         """Show effect settings window"""
         settings_window = ctk.CTkToplevel(self.root)
@@ -0,0 +1,193 @@
+import os
+import time
+from config import FONTS_DIR
+from lazy_import import lazy_import
+from overlay import composite_boxes
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+HUD_WHITE = (255, 255, 255)
+HUD_RED = (0, 0, 255)
+
+
+def find_font(font_dir=FONTS_DIR):
+    """Return the first TrueType/OpenType font in the fonts directory, if any"""
+    if not os.path.isdir(font_dir):
+        return None
+    for file in sorted(os.listdir(font_dir)):
+        if file.lower().endswith(('.ttf', '.otf')):
+            return os.path.join(font_dir, file)
+    return None
+
+
+class GlyphAtlas:
+    """Pre-rendered alpha masks for every printable character in fixed-size cells"""
+    CHARSET = "".join(chr(code) for code in range(32, 127))
+    
+    def __init__(self, height, font_path=None):
+        self.height = height
+        self.glyphs = {}
+        self.cell_width = 0
+        self.cell_height = 0
+        
+        if font_path:
+            try:
+                self.render_font(font_path)
+                return
+            except Exception as e:
+                print(f"HUD font error ({os.path.basename(font_path)}): {str(e)}")
+        self.render_hershey()
+        
+    def render_font(self, font_path):
+        """Render glyphs from a TrueType font with Pillow"""
+        from PIL import Image, ImageDraw, ImageFont
+        font = ImageFont.truetype(font_path, self.height)
+        ascent, descent = font.getmetrics()
+        self.cell_height = ascent + descent
+        self.cell_width = max(int(font.getlength(ch) + 0.5) for ch in self.CHARSET)
+        
+        for ch in self.CHARSET:
+            image = Image.new("L", (self.cell_width, self.cell_height), 0)
+            ImageDraw.Draw(image).text((0, 0), ch, fill=255, font=font)
+            self.glyphs[ch] = np.asarray(image, dtype=np.uint8)
+            
+    def render_hershey(self):
+        """Fallback: render glyphs with OpenCV's built-in Hershey font"""
+        face = cv2.FONT_HERSHEY_SIMPLEX
+        thickness = max(1, self.height // 12)
+        scale = cv2.getFontScaleFromHeight(face, self.height, thickness)
+        sizes = {ch: cv2.getTextSize(ch, face, scale, thickness) for ch in self.CHARSET}
+        baseline = max(base for (_, _), base in sizes.values())
+        self.cell_width = max(w for (w, _), _ in sizes.values()) + thickness
+        self.cell_height = max(h for (_, h), _ in sizes.values()) + baseline + thickness
+        
+        for ch in self.CHARSET:
+            mask = np.zeros((self.cell_height, self.cell_width), dtype=np.uint8)
+            cv2.putText(mask, ch, (0, self.cell_height - baseline), face, scale, 255, thickness, cv2.LINE_AA)
+            self.glyphs[ch] = mask
+            
+    def glyph(self, ch):
+        return self.glyphs.get(ch, self.glyphs["?"])
+
+
+class HudField:
+    """A run of monospace character cells at a fixed position"""
+    def __init__(self, x, y, length, color, lead=0):
+        self.x = x
+        self.y = y
+        self.length = length
+        self.color = color
+        self.lead = lead  # Extra cells reserved before the text (e.g. the REC dot)
+        self.text = " " * length
+
+
+class HudOverlay:
+    """FNAF camera HUD (REC indicator, camera label, clock) drawn from a cached glyph atlas"""
+    def __init__(self, font_dir=FONTS_DIR):
+        self.font_path = find_font(font_dir)
+        self.size = None
+        self.atlas = None
+        self.premultiplied = None
+        self.inverse_alpha = None
+        self.fields = {}
+        self.boxes = []
+        self.dot_visible = False
+        
+    def setup(self, size):
+        """Build the atlas and empty HUD planes for a resolution"""
+        width, height = size
+        self.size = size
+        self.atlas = GlyphAtlas(max(12, height // 22), self.font_path)
+        self.premultiplied = np.zeros((height, width, 3), dtype=np.uint8)
+        self.inverse_alpha = np.full((height, width, 3), 255, dtype=np.uint8)
+        self.fields = {}
+        self.boxes = []
+        self.dot_visible = False
+        
+        # Blinking REC dot: one cell-sized disc
+        cell_w, cell_h = self.atlas.cell_width, self.atlas.cell_height
+        radius = max(2, min(cell_w, cell_h) // 3)
+        self.dot_mask = np.zeros((cell_h, cell_w), dtype=np.uint8)
+        cv2.circle(self.dot_mask, (cell_w // 2, cell_h // 2), radius, 255, -1, cv2.LINE_AA)
+        
+    def place_field(self, name, text, color, anchor, lead=0):
+        """(Re)create a field for text anchored to a frame corner"""
+        width, height = self.size
+        cell_w, cell_h = self.atlas.cell_width, self.atlas.cell_height
+        margin = cell_h // 2
+        length = len(text)
+        
+        x = margin + lead * cell_w if anchor[0] == "left" else width - margin - length * cell_w
+        y = margin if anchor[1] == "top" else height - margin - cell_h
+        x, y = max(lead * cell_w, x), max(0, y)
+        
+        old = self.fields.get(name)
+        if old is not None:
+            self.clear(old.x - old.lead * cell_w, old.y, (old.lead + old.length) * cell_w, cell_h)
+            
+        field = HudField(x, y, length, color, lead)
+        self.fields[name] = field
+        
+        # Only these boxes are composited each frame
+        self.boxes = [
+            (f.y, min(height, f.y + cell_h), f.x - f.lead * cell_w, min(width, f.x + f.length * cell_w))
+            for f in self.fields.values()
+        ]
+        return field
+        
+    def clear(self, x, y, w, h):
+        self.premultiplied[y:y + h, x:x + w] = 0
+        self.inverse_alpha[y:y + h, x:x + w] = 255
+        
+    def blit(self, x, y, mask, color):
+        """Write one cell of the HUD planes from an alpha mask"""
+        frame_h, frame_w = self.premultiplied.shape[:2]
+        h = min(mask.shape[0], frame_h - y)
+        w = min(mask.shape[1], frame_w - x)
+        if h <= 0 or w <= 0:
+            return
+        mask = mask[:h, :w]
+        self.premultiplied[y:y + h, x:x + w] = (mask[..., None].astype(np.uint16) * color // 255).astype(np.uint8)
+        self.inverse_alpha[y:y + h, x:x + w] = (255 - mask)[..., None]
+        
+    def set_text(self, name, text, color=HUD_WHITE, anchor=("left", "top"), lead=0):
+        """Update a field, re-blitting only the characters that changed"""
+        field = self.fields.get(name)
+        if field is None or field.length != len(text) or field.color != color:
+            field = self.place_field(name, text, color, anchor, lead)
+            if name == "rec":
+                self.dot_visible = False
+            
+        cell_w = self.atlas.cell_width
+        for i, (old, new) in enumerate(zip(field.text, text)):
+            if old != new:
+                self.blit(field.x + i * cell_w, field.y, self.atlas.glyph(new), color)
+        field.text = text
+        
+    def set_dot(self, visible):
+        """Show or hide the REC dot in the cell before the REC label"""
+        if visible == self.dot_visible:
+            return
+        field = self.fields["rec"]
+        x = field.x - self.atlas.cell_width
+        if visible:
+            self.blit(x, field.y, self.dot_mask, HUD_RED)
+        else:
+            self.clear(x, field.y, self.atlas.cell_width, self.atlas.cell_height)
+        self.dot_visible = visible
+        
+    def apply(self, frame, camera_label, clock_format="%H:%M:%S", recording=True, now=None):
+        """Composite the HUD onto frame in place and return it"""
+        height, width = frame.shape[:2]
+        if self.size != (width, height):
+            self.setup((width, height))
+            
+        now = time.time() if now is None else now
+        
+        self.set_text("rec", "REC" if recording else "   ", lead=1)
+        self.set_dot(recording and int(now * 2) % 2 == 0)
+        self.set_text("camera", camera_label, anchor=("right", "top"))
+        self.set_text("clock", time.strftime(clock_format, time.localtime(now)), anchor=("left", "bottom"))
+        
+        return composite_boxes(frame, self.premultiplied, self.inverse_alpha, self.boxes)
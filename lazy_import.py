@@ -0,0 +1,28 @@
+import importlib
+import sys
+
+
+class LazyModule:
+    """Module proxy that imports the real module on first attribute access"""
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+        
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+        
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    """Return the module if already imported, otherwise a lazy proxy for it"""
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
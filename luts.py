@@ -0,0 +1,119 @@
+from lazy_import import lazy_import
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+
+def channel_lut(gains, offsets):
+    """Build a (256, 1, 3) BGR lookup table applying value * gain + offset per channel"""
+    values = np.arange(256, dtype=np.float32)
+    table = np.empty((256, 1, 3), dtype=np.uint8)
+    for channel, (gain, offset) in enumerate(zip(gains, offsets)):
+        table[:, 0, channel] = np.clip(np.rint(values * gain + offset), 0, 255).astype(np.uint8)
+    return table
+
+
+def parse_cube(path):
+    """Read an Adobe/Resolve .cube 3D LUT, returning (size, domain_min, domain_max, table)
+    
+    table has shape (size, size, size, 3) indexed [b, g, r] with RGB float outputs.
+    """
+    size = None
+    domain_min = [0.0, 0.0, 0.0]
+    domain_max = [1.0, 1.0, 1.0]
+    rows = []
+    
+    with open(path, "r") as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            keyword = line.split()[0].upper()
+            if keyword == "LUT_3D_SIZE":
+                size = int(line.split()[1])
+            elif keyword == "LUT_1D_SIZE":
+                raise ValueError("1D .cube LUTs are not supported")
+            elif keyword == "DOMAIN_MIN":
+                domain_min = [float(v) for v in line.split()[1:4]]
+            elif keyword == "DOMAIN_MAX":
+                domain_max = [float(v) for v in line.split()[1:4]]
+            elif keyword == "TITLE" or keyword.isalpha() or "_" in keyword:
+                continue
+            else:
+                rows.append([float(v) for v in line.split()[:3]])
+                
+    if size is None:
+        raise ValueError("missing LUT_3D_SIZE")
+    if len(rows) != size ** 3:
+        raise ValueError(f"expected {size ** 3} entries, found {len(rows)}")
+        
+    # Red varies fastest in .cube files, so the natural reshape is [b, g, r]
+    table = np.asarray(rows, dtype=np.float32).reshape(size, size, size, 3)
+    return size, domain_min, domain_max, table
+
+
+class CubeLut:
+    """3D colour grading LUT resampled to a fixed grid for a single gather per frame"""
+    GRID_BITS = 6  # 64 points per axis: 4 input levels per cell, 768 KiB table
+    
+    def __init__(self, path):
+        self.path = path
+        size, domain_min, domain_max, table = parse_cube(path)
+        grid = 1 << self.GRID_BITS
+        
+        # Sample the source LUT at the grid points with trilinear interpolation
+        lo = np.asarray(domain_min, dtype=np.float32)
+        hi = np.asarray(domain_max, dtype=np.float32)
+        shift = 8 - self.GRID_BITS
+        # Each grid cell covers 2**shift input levels; sample at the middle of the cell
+        levels = ((np.arange(grid, dtype=np.float32) * (1 << shift)) + ((1 << shift) - 1) / 2.0) / 255.0
+        coords = [
+            np.clip((levels - lo[c]) / (hi[c] - lo[c]), 0.0, 1.0) * (size - 1)
+            for c in range(3)  # r, g, b
+        ]
+        rgb = self.trilinear(table, coords[2], coords[1], coords[0])
+        
+        # Pack each BGR output into one little-endian uint32 so the gather moves one word per pixel
+        bgr = np.clip(np.rint(rgb[..., ::-1] * 255.0), 0, 255).astype(np.uint32).reshape(-1, 3)
+        self.table = (bgr[:, 0] | (bgr[:, 1] << 8) | (bgr[:, 2] << 16)).astype("<u4")
+        
+        # Per-channel LUTs turn a BGR pixel into its flat grid index with one cv2.LUT
+        cell = np.arange(256, dtype=np.int32) >> shift
+        self.index_lut = np.empty((256, 1, 3), dtype=np.int32)
+        self.index_lut[:, 0, 0] = cell << (2 * self.GRID_BITS)  # blue
+        self.index_lut[:, 0, 1] = cell << self.GRID_BITS        # green
+        self.index_lut[:, 0, 2] = cell                          # red
+        
+    @staticmethod
+    def trilinear(table, b, g, r):
+        """Sample table[b, g, r] on the outer product of the coordinate vectors"""
+        size = table.shape[0]
+        b0 = np.floor(b).astype(np.int32)
+        g0 = np.floor(g).astype(np.int32)
+        r0 = np.floor(r).astype(np.int32)
+        b1 = np.minimum(b0 + 1, size - 1)
+        g1 = np.minimum(g0 + 1, size - 1)
+        r1 = np.minimum(r0 + 1, size - 1)
+        fb = (b - b0)[:, None, None, None]
+        fg = (g - g0)[None, :, None, None]
+        fr = (r - r0)[None, None, :, None]
+        
+        def corner(bi, gi, ri):
+            return table[np.ix_(bi, gi, ri)]
+            
+        c00 = corner(b0, g0, r0) * (1 - fr) + corner(b0, g0, r1) * fr
+        c01 = corner(b0, g1, r0) * (1 - fr) + corner(b0, g1, r1) * fr
+        c10 = corner(b1, g0, r0) * (1 - fr) + corner(b1, g0, r1) * fr
+        c11 = corner(b1, g1, r0) * (1 - fr) + corner(b1, g1, r1) * fr
+        c0 = c00 * (1 - fg) + c01 * fg
+        c1 = c10 * (1 - fg) + c11 * fg
+        return c0 * (1 - fb) + c1 * fb
+        
+    def apply(self, frame):
+        """Grade a BGR frame"""
+        height, width = frame.shape[:2]
+        index = cv2.LUT(frame, self.index_lut)
+        flat = index[..., 0] + index[..., 1]
+        flat += index[..., 2]
+        graded = np.take(self.table, flat).view(np.uint8).reshape(height, width, 4)
+        return cv2.cvtColor(graded, cv2.COLOR_BGRA2BGR)
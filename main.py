@@ -1,17 +1,95 @@
-from gui import ModernFNAFGui
-from camera import CameraManager
-from effects import FNAFEffects
-from animations import FNAFAnimations
+from startup import timer
+import argparse
 import tkinter as tk
 import os
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="FNAF camera effects")
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="export frame latency traces on exit (.json for Chrome trace, .csv for CSV)"
+    )
+    parser.add_argument("--no-tracing", action="store_true", help="turn per-frame tracing off")
+    parser.add_argument(
+        "--control",
+        action="store_true",
+        help="accept effect and preset commands on the local control socket"
+    )
+    parser.add_argument(
+        "--mjpeg-port",
+        type=int,
+        metavar="PORT",
+        help="stream the output as MJPEG over HTTP on PORT"
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="PORT",
+        help="serve Prometheus metrics on 127.0.0.1:PORT/metrics"
+    )
+    return parser.parse_args()
+
+def start_metrics(camera, port):
+    """Serve pipeline health on localhost for Prometheus"""
+    from metrics import metrics, MetricsServer
+    metrics.add_gauge("fnaf_target_fps", "Configured capture and output rate", lambda: camera.fps)
+    metrics.add_gauge(
+        "fnaf_dropped_frames_total", "Frames dropped by each output since it started",
+        lambda: camera.health_stats()["dropped"], label="output", kind="counter"
+    )
+    metrics.add_gauge(
+        "fnaf_queue_depth", "Frames waiting in each output queue",
+        lambda: camera.health_stats()["queued"], label="output"
+    )
+    try:
+        server = MetricsServer(metrics, port)
+    except OSError as e:
+        print(f"Metrics server error: {str(e)}")
+        return None
+    server.start()
+    print(f"Metrics on http://127.0.0.1:{port}/metrics")
+    return server
+
+def start_control(effects, app):
+    """Let stream decks and scripts drive the effects over the local control API"""
+    from control import ControlServer
+    from config import DEFAULT_SETTINGS
+    try:
+        server = ControlServer(
+            effects, DEFAULT_SETTINGS["control_socket"], DEFAULT_SETTINGS["control_port"],
+            cameras=app.camera_effects
+        )
+    except OSError as e:
+        print(f"Control server error: {str(e)}")
+        return None
+    server.start()
+    print(f"Control API on {server.address}")
+    return server
+
 def main():
+    args = parse_args()
+    
     # Create required directories
     os.makedirs("config", exist_ok=True)
     
     root = tk.Tk()
     root.configure(bg="#1a1a1a")
     
+    # Configure window and get it on screen before importing the heavy GUI stack
+    root.geometry("1280x720")
+    root.minsize(800, 600)
+    root.update_idletasks()
+    root.update()
+    timer.mark("first window")
+    
+    from gui import ModernFNAFGui
+    from camera import CameraManager
+    from effects import FNAFEffects
+    from animations import FNAFAnimations
+    from config import DEFAULT_SETTINGS
+    timer.mark("gui imports")
+    
     # Initialize managers
     animations = FNAFAnimations()
     camera = CameraManager()
@@ -19,12 +97,41 @@ def main():
     
     # Create GUI with all managers
     app = ModernFNAFGui(root, camera, effects, animations)
+    timer.mark("widgets built")
     
-    # Configure window
-    root.geometry("1280x720")
-    root.minsize(800, 600)
+    # Decode glitch frames and extras in the background
+    app.load_effects_async()
+    if DEFAULT_SETTINGS["hot_reload_enabled"]:
+        effects.start_hot_reload()
+    timer.report()
+    
+    from tracing import tracer
+    if args.no_tracing:
+        tracer.enabled = False
+        
+    metrics_server = None
+    if args.metrics_port or DEFAULT_SETTINGS["metrics_enabled"]:
+        metrics_server = start_metrics(camera, args.metrics_port or DEFAULT_SETTINGS["metrics_port"])
+    
+    control_server = None
+    if args.control or DEFAULT_SETTINGS["control_enabled"]:
+        control_server = start_control(effects, app)
+        
+    if args.mjpeg_port or DEFAULT_SETTINGS["mjpeg_enabled"]:
+        stream = camera.start_mjpeg({"mjpeg_port": args.mjpeg_port or DEFAULT_SETTINGS["mjpeg_port"]})
+        if stream:
+            print(f"MJPEG stream on {stream.address}")
     
     root.mainloop()
+    
+    camera.stop_mjpeg()
+    if control_server:
+        control_server.stop()
+    if metrics_server:
+        metrics_server.stop()
+    if args.trace:
+        frames = tracer.export(args.trace)
+        print(f"Trace of {frames} frames written to {args.trace}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,225 @@
+"""Pipeline health metrics in Prometheus text format
+
+Counters and histograms are sharded per thread: each video thread only ever
+writes its own cells, so recording a sample takes no lock and a scrape never
+blocks frame processing. A scrape sums the shards, which may be a sample or
+two behind the writers. Gauges are callbacks evaluated at scrape time.
+"""
+import bisect
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Histogram bucket upper bounds in seconds
+TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.02, 0.033, 0.05, 0.1, 0.25, 0.5, 1.0)
+# Virtual camera deadline lateness, the same edges as pacing.JITTER_BUCKETS_MS
+LATENESS_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05)
+
+
+class ShardedCells:
+    """Per-thread lists of numbers, written lock-free by their owning thread"""
+    def __init__(self, size):
+        self.size = size
+        self.local = threading.local()
+        self.shards = []
+        self.lock = threading.Lock()  # Only taken the first time a thread records
+
+    def cells(self):
+        cells = getattr(self.local, "cells", None)
+        if cells is None:
+            cells = [0] * self.size
+            with self.lock:
+                self.shards.append(cells)
+            self.local.cells = cells
+        return cells
+
+    def totals(self):
+        totals = [0] * self.size
+        for cells in list(self.shards):
+            for index, value in enumerate(cells):
+                totals[index] += value
+        return totals
+
+
+class Counter:
+    def __init__(self, name, help_text, label=None):
+        self.name = name
+        self.help_text = help_text
+        self.label = label  # Single label name, e.g. "stage"
+        self.children = {}
+
+    def child(self, label_value=None):
+        child = self.children.get(label_value)
+        if child is None:
+            child = self.children.setdefault(label_value, ShardedCells(1))
+        return child
+
+    def inc(self, amount=1, label_value=None):
+        self.child(label_value).cells()[0] += amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for label_value, child in sorted(self.children.items(), key=lambda item: str(item[0])):
+            lines.append(f"{self.name}{format_labels(self.label, label_value)} {child.totals()[0]}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, label=None, buckets=TIME_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = tuple(buckets)
+        self.children = {}
+
+    def observe(self, value, label_value=None):
+        child = self.children.get(label_value)
+        if child is None:
+            # Cells: one per bucket, +Inf, then the sum
+            child = self.children.setdefault(label_value, ShardedCells(len(self.buckets) + 2))
+        cells = child.cells()
+        cells[bisect.bisect_left(self.buckets, value)] += 1
+        cells[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_value, child in sorted(self.children.items(), key=lambda item: str(item[0])):
+            totals = child.totals()
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), totals[:-1]):
+                cumulative += count
+                labels = format_labels(self.label, label_value, le=bound)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            base = format_labels(self.label, label_value)
+            lines.append(f"{self.name}_sum{base} {totals[-1]:.6f}")
+            lines.append(f"{self.name}_count{base} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """A value read at scrape time (kind "counter" for monotonic totals kept elsewhere)"""
+    def __init__(self, name, help_text, read, kind="gauge"):
+        self.name = name
+        self.help_text = help_text
+        self.read = read  # read() -> number, or {label_value: number} with label
+        self.kind = kind
+
+    def render(self, label=None):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        try:
+            value = self.read()
+        except Exception:
+            return []
+        if value is None:
+            return []
+        if isinstance(value, dict):
+            for label_value, number in sorted(value.items()):
+                lines.append(f"{self.name}{format_labels(label, label_value)} {number}")
+        else:
+            lines.append(f"{self.name} {value}")
+        return lines
+
+
+def format_labels(label, label_value, le=None):
+    pairs = []
+    if label and label_value is not None:
+        pairs.append(f'{label}="{label_value}"')
+    if le is not None:
+        pairs.append(f'le="{le}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def resident_memory_bytes():
+    """Process RSS, from psutil when available, else /proc or getrusage"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024  # Peak, not current
+    except ImportError:
+        return None
+
+
+class Metrics:
+    """Registry of the pipeline's metrics"""
+    def __init__(self):
+        self.frames_total = Counter("fnaf_frames_total", "Frames processed by the pipeline")
+        self.frame_seconds = Histogram("fnaf_frame_seconds", "Time from capture to outputs delivered")
+        self.stage_seconds = Histogram("fnaf_stage_seconds", "Time spent in each effect stage", label="stage")
+        self.stage_failures = Counter("fnaf_stage_failures_total", "Effect stage exceptions", label="stage")
+        self.output_lateness = Histogram(
+            "fnaf_output_lateness_seconds", "How late each virtual camera frame went out after its deadline",
+            buckets=LATENESS_BUCKETS
+        )
+        self.output_repeated = Counter("fnaf_output_repeated_frames_total", "Virtual camera frames repeated for lack of a new one")
+        self.output_skipped = Counter("fnaf_output_skipped_deadlines_total", "Virtual camera deadlines missed entirely")
+        self.gauges = [
+            Gauge("process_resident_memory_bytes", "Resident memory size in bytes", resident_memory_bytes),
+            Gauge("process_cpu_seconds_total", "Total user and system CPU time in seconds", time.process_time, "counter")
+        ]
+        self.labelled_gauges = []
+
+    def add_gauge(self, name, help_text, read, label=None, kind="gauge"):
+        """Register a gauge read at scrape time; read may return {label_value: number}"""
+        gauge = Gauge(name, help_text, read, kind)
+        if label:
+            self.labelled_gauges.append((gauge, label))
+        else:
+            self.gauges.append(gauge)
+
+    def render(self):
+        lines = []
+        for metric in (self.frames_total, self.frame_seconds, self.stage_seconds, self.stage_failures,
+                       self.output_lateness, self.output_repeated, self.output_skipped):
+            lines.extend(metric.render())
+        for gauge in self.gauges:
+            lines.extend(gauge.render())
+        for gauge, label in self.labelled_gauges:
+            lines.extend(gauge.render(label))
+        return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.metrics.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes every few seconds would flood the console
+
+
+class MetricsServer(threading.Thread):
+    """Serve /metrics on localhost from a background thread"""
+    def __init__(self, registry, port=9464, host="127.0.0.1"):
+        super().__init__(daemon=True)
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self.server.daemon_threads = True
+        self.server.metrics = registry
+
+    def run(self):
+        self.server.serve_forever()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+metrics = Metrics()
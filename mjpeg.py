@@ -0,0 +1,157 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread, Condition, Lock
+from lazy_import import lazy_import
+
+cv2 = lazy_import("cv2")
+
+BOUNDARY = "frame"
+PAGE = b"<html><body style='margin:0;background:#000'><img src='/stream.mjpg' style='width:100%'></body></html>"
+
+
+class MjpegStream(Thread):
+    """Serve the processed output as MJPEG over HTTP
+
+    Each frame is encoded once on this thread and every client is sent the same
+    bytes. A client that can't keep up just gets the newest frame when it is
+    ready for another, so nothing is buffered per client. With nobody connected
+    the sink is disabled and nothing is resized or encoded.
+    """
+    def __init__(self, port=8080, host="0.0.0.0", jpeg_quality=70):
+        super().__init__(daemon=True)
+        self.jpeg_quality = jpeg_quality
+        self.sink = None  # Fan-out sink feeding push(), enabled only while clients are connected
+        self.running = False
+
+        # Newest frame waiting for the encoder; an unencoded frame is replaced, not queued
+        self.frame_ready = Condition()
+        self.pending = None
+        self.skipped = 0
+
+        # Newest encoded multipart chunk, shared by every client
+        self.part_ready = Condition()
+        self.part = None
+        self.sequence = 0
+
+        self.clients_lock = Lock()
+        self.clients = 0
+
+        self.server = ThreadingHTTPServer((host, port), MjpegHandler)
+        self.server.daemon_threads = True
+        self.server.stream = self
+        self.address = f"http://{host}:{port}/"
+
+    def start(self):
+        self.running = True
+        Thread(target=self.server.serve_forever, daemon=True, name="mjpeg-http").start()
+        super().start()
+
+    def stop(self):
+        self.running = False
+        with self.frame_ready:
+            self.frame_ready.notify_all()
+        with self.part_ready:
+            self.part_ready.notify_all()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def push(self, frame):
+        """Hand the encoder the newest frame (the pipeline must not modify it afterwards)"""
+        if not self.running or not self.clients:
+            return False
+        with self.frame_ready:
+            if self.pending is not None:
+                self.skipped += 1
+            self.pending = frame
+            self.frame_ready.notify()
+        return True
+
+    def run(self):
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]
+        while self.running:
+            with self.frame_ready:
+                while self.running and self.pending is None:
+                    self.frame_ready.wait()
+                frame, self.pending = self.pending, None
+            if frame is None:
+                continue
+            try:
+                ok, encoded = cv2.imencode(".jpg", frame, params)
+            except Exception as e:
+                print(f"MJPEG encode error: {str(e)}")
+                continue
+            if not ok:
+                continue
+            data = encoded.tobytes()
+            header = f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(data)}\r\n\r\n"
+            with self.part_ready:
+                self.part = header.encode() + data + b"\r\n"
+                self.sequence += 1
+                self.part_ready.notify_all()
+
+    def next_part(self, last_sequence, timeout=1.0):
+        """Newest chunk after last_sequence, or (None, last_sequence) on timeout"""
+        with self.part_ready:
+            self.part_ready.wait_for(lambda: self.sequence != last_sequence or not self.running, timeout)
+            if self.sequence == last_sequence:
+                return None, last_sequence
+            return self.part, self.sequence
+
+    def add_client(self):
+        with self.clients_lock:
+            self.clients += 1
+            if self.sink is not None:
+                self.sink.enabled = True
+
+    def remove_client(self):
+        with self.clients_lock:
+            self.clients -= 1
+            if self.clients == 0:
+                if self.sink is not None:
+                    self.sink.enabled = False
+                with self.frame_ready:
+                    self.pending = None
+
+    def stats(self):
+        return {"clients": self.clients, "skipped": self.skipped, "frames": self.sequence}
+
+
+class MjpegHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/":
+            self.send_body(PAGE, "text/html")
+        elif path == "/stream.mjpg":
+            self.send_stream()
+        else:
+            self.send_error(404)
+
+    def send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_stream(self):
+        stream = self.server.stream
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+        self.send_header("Cache-Control", "no-cache, private")
+        self.send_header("Pragma", "no-cache")
+        self.end_headers()
+
+        stream.add_client()
+        sequence = stream.sequence
+        try:
+            while stream.running:
+                part, sequence = stream.next_part(sequence)
+                if part is not None:
+                    # Blocks only this client; the encoder keeps replacing the newest chunk
+                    self.wfile.write(part)
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            pass
+        finally:
+            stream.remove_client()
+
+    def log_message(self, format, *args):
+        pass  # One line per request would flood the console
@@ -0,0 +1,136 @@
+import os
+import time
+from threading import Thread, Lock
+from camera import CameraManager
+from effects import FNAFEffects
+from lazy_import import lazy_import
+
+cv2 = lazy_import("cv2")
+
+MAX_CAMERAS = 4
+
+
+class CameraPipeline:
+    """One camera with its own effect settings, optional virtual output and stats"""
+    def __init__(self, camera_index, effects, virtual_device=None):
+        self.camera_index = camera_index
+        self.camera = CameraManager()
+        # Only one default virtual device exists (and the main camera may hold it),
+        # so a pipeline only gets a virtual output when it names its own device
+        self.camera.virtual_device = virtual_device or None
+        self.camera.virtual_camera_enabled = bool(virtual_device)
+        self.effects = effects
+        self.thread = None
+
+        # Measured once a second on the pipeline thread
+        self.stats_lock = Lock()
+        self.fps = 0.0
+        self.cpu_percent = 0.0
+        self.frames = 0
+
+    def start(self):
+        if not self.camera.start_camera(self.camera_index):
+            return False
+        self.thread = Thread(target=self.run, daemon=True, name=f"camera-{self.camera_index}")
+        self.thread.start()
+        return True
+
+    def stop(self):
+        self.camera.stop_camera()
+
+    def run(self):
+        window_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        window_frames = 0
+        try:
+            for _ in self.camera.process_video(self.effects):
+                window_frames += 1
+                now = time.perf_counter()
+                if now - window_start >= 1.0:
+                    # thread_time only counts this pipeline's own thread
+                    cpu = time.thread_time()
+                    with self.stats_lock:
+                        self.fps = window_frames / (now - window_start)
+                        self.cpu_percent = 100.0 * (cpu - cpu_start) / (now - window_start)
+                        self.frames += window_frames
+                    window_start, cpu_start, window_frames = now, cpu, 0
+                if not self.camera.running:
+                    break
+        except Exception as e:
+            print(f"Camera {self.camera_index} error: {str(e)}")
+
+    def stats(self):
+        with self.stats_lock:
+            return {
+                "camera": self.camera_index,
+                "running": self.camera.running,
+                "virtual_device": self.camera.virtual_device,
+                "fps": self.fps,
+                "cpu_percent": self.cpu_percent,
+                "frames": self.frames
+            }
+
+
+class MultiCameraManager:
+    """Run several camera pipelines at once on one shared, read-only asset store"""
+    def __init__(self, shared_effects, max_cameras=MAX_CAMERAS):
+        self.shared_effects = shared_effects  # Loads and hot-reloads the assets everyone uses
+        self.max_cameras = max_cameras
+        self.pipelines = []
+
+    def add_camera(self, camera_index, virtual_device=None):
+        """Create a pipeline whose effect settings start as a copy of the shared ones"""
+        if len(self.pipelines) >= self.max_cameras:
+            raise ValueError(f"At most {self.max_cameras} cameras can run at once")
+        if any(p.camera_index == camera_index for p in self.pipelines):
+            raise ValueError(f"Camera {camera_index} is already added")
+
+        source = self.shared_effects
+        effects = FNAFEffects(source.animations, assets_from=source)
+        effects.effect_enabled.update(source.effect_enabled)
+        effects.effect_intensities.update(source.effect_intensities)
+        effects.effect_speeds.update(source.effect_speeds)
+        effects.hud_enabled = source.hud_enabled
+        effects.hud_camera_label = f"CAM {len(self.pipelines) + 1}"
+
+        pipeline = CameraPipeline(camera_index, effects, virtual_device)
+        self.pipelines.append(pipeline)
+        return pipeline
+
+    def effects_for(self, camera_index):
+        """The effect settings of one pipeline, for the GUI and the control API"""
+        for pipeline in self.pipelines:
+            if pipeline.camera_index == camera_index:
+                return pipeline.effects
+        raise ValueError(f"No camera pipeline {camera_index}")
+
+    def remove_camera(self, camera_index):
+        for pipeline in list(self.pipelines):
+            if pipeline.camera_index == camera_index:
+                pipeline.stop()
+                self.pipelines.remove(pipeline)
+        self.balance()
+
+    def start_all(self):
+        """Start every pipeline; returns the camera indices that failed to open"""
+        failed = [p.camera_index for p in self.pipelines if not p.camera.running and not p.start()]
+        self.balance()
+        return failed
+
+    def stop_all(self):
+        for pipeline in self.pipelines:
+            pipeline.stop()
+        self.balance()
+
+    def balance(self):
+        """Split OpenCV's worker threads between the running pipelines
+
+        Each pipeline already has its own thread; without this every one of them
+        would also fan out to all cores inside OpenCV and they would contend.
+        """
+        running = sum(1 for p in self.pipelines if p.camera.running)
+        cores = os.cpu_count() or 1
+        cv2.setNumThreads(max(1, cores // max(1, running)))
+
+    def stats(self):
+        return [pipeline.stats() for pipeline in self.pipelines]
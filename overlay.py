@@ -0,0 +1,105 @@
+from lazy_import import lazy_import
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+
+def opaque_boxes(alpha, tile=32):
+    """Split the visible part of an alpha plane into boxes, skipping transparent tiles"""
+    height, width = alpha.shape
+    rows = -(-height // tile)
+    cols = -(-width // tile)
+    padded = np.zeros((rows * tile, cols * tile), dtype=bool)
+    padded[:height, :width] = alpha > 0
+    occupied = padded.reshape(rows, tile, cols, tile).any(axis=(1, 3))
+    
+    boxes = []
+    for row in range(rows):
+        col = 0
+        while col < cols:
+            if not occupied[row, col]:
+                col += 1
+                continue
+            start = col
+            while col < cols and occupied[row, col]:
+                col += 1
+                
+            # Tighten the run of tiles to the pixels that are actually visible
+            y0, y1 = row * tile, min((row + 1) * tile, height)
+            x0, x1 = start * tile, min(col * tile, width)
+            visible = alpha[y0:y1, x0:x1] > 0
+            ys = np.flatnonzero(visible.any(axis=1))
+            xs = np.flatnonzero(visible.any(axis=0))
+            box = (int(y0 + ys[0]), int(y0 + ys[-1] + 1), int(x0 + xs[0]), int(x0 + xs[-1] + 1))
+            
+            # Merge with the box above when it covers the same columns
+            if boxes and boxes[-1][1] == box[0] and boxes[-1][2:] == box[2:]:
+                boxes[-1] = (boxes[-1][0], box[1], box[2], box[3])
+            else:
+                boxes.append(box)
+    return boxes
+
+
+def composite_boxes(frame, premultiplied, inverse_alpha, boxes):
+    """Blend premultiplied planes onto frame in place, only inside boxes"""
+    for y0, y1, x0, x1 in boxes:
+        roi = frame[y0:y1, x0:x1]
+        # dst = frame * (1 - alpha) + premultiplied colour
+        cv2.multiply(roi, inverse_alpha[y0:y1, x0:x1], dst=roi, scale=1.0 / 255.0)
+        cv2.add(roi, premultiplied[y0:y1, x0:x1], dst=roi)
+    return frame
+
+
+def blend_boxes(frame, premultiplied, alpha, boxes, opacity):
+    """Blend full-opacity premultiplied planes onto frame in place at opacity, only inside boxes"""
+    for y0, y1, x0, x1 in boxes:
+        roi = frame[y0:y1, x0:x1]
+        # dst = frame * (1 - opacity * alpha) + opacity * premultiplied colour
+        covered = cv2.multiply(roi, alpha[y0:y1, x0:x1], scale=opacity / 255.0)
+        cv2.subtract(roi, covered, dst=roi)
+        if opacity >= 1.0:
+            cv2.add(roi, premultiplied[y0:y1, x0:x1], dst=roi)
+        else:
+            cv2.addWeighted(roi, 1.0, premultiplied[y0:y1, x0:x1], opacity, 0, dst=roi)
+    return frame
+
+
+class OverlayLayer:
+    """All extras flattened into one premultiplied layer at full opacity for one resolution
+
+    Built by the asset loader or watcher thread whenever the extras or the
+    resolution change; opacity is applied at composite time.
+    """
+    def __init__(self, extras, size):
+        width, height = size
+        self.size = size
+        color = np.zeros((height, width, 3), dtype=np.float32)
+        alpha = np.zeros((height, width), dtype=np.float32)
+        
+        for img in extras:
+            if img.shape[:2] != (height, width):
+                continue
+            a = img[..., 3].astype(np.float32) * (1.0 / 255.0)
+            # Porter-Duff "over", so later files draw on top of earlier ones
+            color = img[..., :3].astype(np.float32) * a[..., None] + color * (1.0 - a[..., None])
+            alpha = a + alpha * (1.0 - a)
+            
+        self.premultiplied = np.clip(color + 0.5, 0, 255).astype(np.uint8)  # BGR colour already multiplied by alpha
+        plane = np.clip(alpha * 255.0 + 0.5, 0, 255).astype(np.uint8)
+        self.alpha = cv2.merge([plane, plane, plane])
+        self.boxes = opaque_boxes(plane)
+
+
+class OverlayCompositor:
+    """Composite the flattened RGBA images from static/extra onto the frame"""
+    def apply(self, frame, layer, opacity):
+        """Composite layer onto frame in place at opacity and return it"""
+        if layer is None or not layer.boxes:
+            return frame
+        if layer.size != (frame.shape[1], frame.shape[0]):
+            # Assets for this resolution are still being prepared
+            return frame
+        opacity = min(1.0, float(opacity))
+        if opacity <= 0.0:
+            return frame
+        return blend_boxes(frame, layer.premultiplied, layer.alpha, layer.boxes, opacity)
@@ -0,0 +1,123 @@
+import time
+from threading import Thread, Condition
+from metrics import metrics
+
+# Upper edges (ms) of the deadline-lateness histogram buckets; the last bucket is open-ended
+JITTER_BUCKETS_MS = (1, 2, 5, 10, 20, 50)
+
+
+class FramePacer(Thread):
+    """Emit the newest frame at a steady output rate, whatever rate frames arrive at
+
+    Deadlines are absolute (start + n * period) on the monotonic clock, so sleep
+    overshoot on one frame is made up on the next instead of accumulating. When
+    input is slower than the output rate the last frame is repeated; when it is
+    faster, frames that were never emitted are dropped.
+    """
+    def __init__(self, fps, emit):
+        super().__init__(daemon=True)
+        self.emit = emit  # emit(frame), called on the pacer thread
+        self.period = 1.0 / max(1, fps)
+        self.condition = Condition()
+        self.frame = None
+        self.fresh = False  # Frame not emitted yet
+        self.running = False
+
+        # Stats
+        self.emitted = 0
+        self.repeated = 0
+        self.dropped = 0
+        self.skipped_deadlines = 0
+        self.histogram = [0] * (len(JITTER_BUCKETS_MS) + 1)
+
+    def start(self):
+        self.running = True
+        super().start()
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+
+    def set_fps(self, fps):
+        self.period = 1.0 / max(1, fps)
+
+    def submit(self, frame):
+        """Make frame the one emitted at the next deadline"""
+        with self.condition:
+            if self.fresh:
+                self.dropped += 1
+            self.frame = frame
+            self.fresh = True
+            self.condition.notify()
+
+    def record_lateness(self, late):
+        metrics.output_lateness.observe(late)
+        late_ms = late * 1000.0
+        for index, edge in enumerate(JITTER_BUCKETS_MS):
+            if late_ms < edge:
+                self.histogram[index] += 1
+                return
+        self.histogram[-1] += 1
+
+    def run(self):
+        # Wait for the first frame, then start the deadline clock from it
+        with self.condition:
+            while self.running and self.frame is None:
+                self.condition.wait(0.1)
+        deadline = time.monotonic()
+
+        while self.running:
+            now = time.monotonic()
+            if now < deadline:
+                time.sleep(deadline - now)
+                now = time.monotonic()
+
+            late = now - deadline
+            if late > self.period:
+                # Too far behind to catch up: skip the missed deadlines rather than burst
+                missed = int(late / self.period)
+                self.skipped_deadlines += missed
+                metrics.output_skipped.inc(missed)
+                deadline += missed * self.period
+                late -= missed * self.period
+            self.record_lateness(late)
+
+            with self.condition:
+                frame = self.frame
+                if self.fresh:
+                    self.fresh = False
+                else:
+                    self.repeated += 1
+                    metrics.output_repeated.inc()
+            try:
+                self.emit(frame)
+                self.emitted += 1
+            except Exception as e:
+                print(f"Output error: {str(e)}")
+            deadline += self.period
+
+    def stats(self):
+        """Counters and the deadline-lateness histogram as {"<1ms": n, ...}"""
+        labels = [f"<{edge}ms" for edge in JITTER_BUCKETS_MS] + [f">={JITTER_BUCKETS_MS[-1]}ms"]
+        histogram = list(self.histogram)
+        
+        # Bucket holding the 95th percentile of lateness
+        total = sum(histogram)
+        p95 = None
+        if total:
+            running = 0
+            for label, count in zip(labels, histogram):
+                running += count
+                if running >= 0.95 * total:
+                    p95 = label
+                    break
+        return {
+            "fps": 1.0 / self.period,
+            "emitted": self.emitted,
+            "repeated": self.repeated,
+            "dropped": self.dropped,
+            "skipped_deadlines": self.skipped_deadlines,
+            "jitter": dict(zip(labels, histogram)),
+            "jitter_p95": p95
+        }
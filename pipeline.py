@@ -0,0 +1,154 @@
+from collections import deque
+from threading import Lock
+from lazy_import import lazy_import
+from tracing import tracer
+
+cv2 = lazy_import("cv2")
+
+PIXEL_FORMATS = {
+    "BGR": None,
+    "RGB": "COLOR_BGR2RGB",
+    "GRAY": "COLOR_BGR2GRAY",
+    "BGRA": "COLOR_BGR2BGRA",
+    "RGBA": "COLOR_BGR2RGBA"
+}
+
+INTERPOLATIONS = {
+    "nearest": "INTER_NEAREST",
+    "linear": "INTER_LINEAR",
+    "cubic": "INTER_CUBIC",
+    "area": "INTER_AREA",
+    "lanczos": "INTER_LANCZOS4"
+}
+
+
+def interpolation_flag(name):
+    """Map an interpolation name from the settings to its OpenCV flag"""
+    return getattr(cv2, INTERPOLATIONS.get(name, "INTER_LINEAR"))
+
+
+def scaled_size(size, scale):
+    """Scale a (width, height) size, keeping both sides even and at least 2 pixels"""
+    width, height = size
+    return (max(2, int(width * scale) & ~1), max(2, int(height * scale) & ~1))
+
+
+class ProcessingScaler:
+    """Run the effect chain at a reduced resolution and scale once on the way in and out"""
+    def __init__(self, output_scale=1.0, preview_scale=1.0):
+        self.output_scale = output_scale    # Chain scale while the virtual camera is fed
+        self.preview_scale = preview_scale  # Chain scale when only the preview is shown
+        
+    def processing_size(self, capture_size, output_active):
+        """Size the effect chain runs at for this frame"""
+        scale = self.output_scale if output_active else self.preview_scale
+        return scaled_size(capture_size, min(1.0, max(0.1, scale)))
+        
+    def downscale(self, frame, size):
+        """Downscale a captured frame once before the effect chain"""
+        height, width = frame.shape[:2]
+        if (width, height) == tuple(size):
+            return frame
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        
+
+
+class FrameRing:
+    """The last few processed frames, shared between the pipeline and snapshot readers"""
+    def __init__(self, capacity=8):
+        self.frames = deque(maxlen=max(1, capacity))
+        self.lock = Lock()
+        
+    def push(self, frame, capture_size):
+        """Store a processed frame; the pipeline must not modify it afterwards"""
+        with self.lock:
+            self.frames.append((frame, capture_size))
+            
+    def latest(self):
+        """Copy of the newest frame and the capture size it belongs to, or (None, None)"""
+        with self.lock:
+            if not self.frames:
+                return None, None
+            frame, capture_size = self.frames[-1]
+        return frame.copy(), capture_size
+        
+    def clear(self):
+        with self.lock:
+            self.frames.clear()
+
+
+class Sink:
+    """A consumer of processed frames and the size and pixel format it needs"""
+    def __init__(self, name, callback, scale=1.0, size=None, pixel_format="BGR",
+                 interpolation="linear", allow_upscale=False):
+        self.name = name
+        self.callback = callback          # callback(frame) with the converted frame
+        self.scale = scale                # Size relative to the capture...
+        self.size = size                  # ...or a fixed (width, height)
+        self.pixel_format = pixel_format  # BGR, RGB, GRAY, BGRA or RGBA
+        self.interpolation = interpolation
+        self.allow_upscale = allow_upscale
+        self.enabled = True
+        
+    def target_size(self, capture_size, processed_size):
+        """Resolve the size this sink wants for the current frame"""
+        size = tuple(self.size) if self.size else scaled_size(capture_size, self.scale)
+        if not self.allow_upscale and (size[0] > processed_size[0] or size[1] > processed_size[1]):
+            return processed_size
+        return size
+
+
+class OutputFanout:
+    """Produce every sink's size and pixel format once per frame, sharing intermediates"""
+    def __init__(self):
+        self.sinks = {}
+        
+    def add_sink(self, sink):
+        self.sinks[sink.name] = sink
+        return sink
+        
+    def remove_sink(self, name):
+        self.sinks.pop(name, None)
+        
+    def get_sink(self, name):
+        return self.sinks.get(name)
+        
+    def deliver(self, frame, capture_size):
+        """Resize and convert frame for every enabled sink and hand it over"""
+        sinks = [sink for sink in list(self.sinks.values()) if sink.enabled]
+        if not sinks or frame is None:
+            return
+            
+        processed_size = (frame.shape[1], frame.shape[0])
+        targets = [(sink, sink.target_size(capture_size, processed_size)) for sink in sinks]
+        
+        # Largest first, so each smaller size can come from the nearest larger one
+        images = {processed_size: frame}
+        with tracer.span("resize"):
+            self.resize_all(frame, targets, images)
+            
+        # Each (size, format) pair is converted once and shared by every sink that wants it
+        converted = {}
+        for sink, size in targets:
+            key = (size, sink.pixel_format)
+            if key not in converted:
+                code = PIXEL_FORMATS.get(sink.pixel_format)
+                image = images[size]
+                converted[key] = image if code is None else cv2.cvtColor(image, getattr(cv2, code))
+            try:
+                with tracer.span(sink.name):
+                    sink.callback(converted[key])
+            except Exception as e:
+                print(f"Output error ({sink.name}): {str(e)}")
+                
+    def resize_all(self, frame, targets, images):
+        for sink, size in sorted(targets, key=lambda target: target[1][0] * target[1][1], reverse=True):
+            if size in images:
+                continue
+            larger = [s for s in images if s[0] >= size[0] and s[1] >= size[1]]
+            if larger:
+                source = min(larger, key=lambda s: s[0] * s[1])
+                images[size] = cv2.resize(images[source], size, interpolation=cv2.INTER_AREA)
+            else:
+                images[size] = cv2.resize(frame, size, interpolation=interpolation_flag(sink.interpolation))
+
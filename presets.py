@@ -0,0 +1,38 @@
+import json
+import os
+import re
+from config import PRESETS_DIR
+
+PRESET_NAME = re.compile(r"^[\w \-]{1,64}$")
+
+
+def preset_path(name):
+    """File for a preset; names are limited so they can't escape PRESETS_DIR"""
+    name = str(name).strip()
+    if not PRESET_NAME.match(name):
+        raise ValueError(f"Invalid preset name: {name!r}")
+    return os.path.join(PRESETS_DIR, f"{name}.json")
+
+
+def list_presets():
+    if not os.path.isdir(PRESETS_DIR):
+        return []
+    return sorted(os.path.splitext(f)[0] for f in os.listdir(PRESETS_DIR) if f.endswith(".json"))
+
+
+def save_preset(name, settings):
+    """Save a settings_snapshot() as a named preset"""
+    os.makedirs(PRESETS_DIR, exist_ok=True)
+    path = preset_path(name)
+    with open(path, "w") as f:
+        json.dump(settings, f, indent=2)
+    return path
+
+
+def load_preset(name):
+    """Settings saved by save_preset(), ready for FNAFEffects.queue_changes()"""
+    path = preset_path(name)
+    if not os.path.exists(path):
+        raise ValueError(f"No preset named {name!r}")
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,153 @@
+import os
+import time
+from collections import deque
+from queue import Queue, Full, Empty
+from threading import Thread, Lock
+from lazy_import import lazy_import
+
+cv2 = lazy_import("cv2")
+
+DROP_POLICIES = ("oldest", "newest")
+
+
+class Recorder(Thread):
+    """Encode processed frames to a video file without ever blocking the pipeline
+
+    Frames are stamped when they arrive and mapped onto the file's fixed fps
+    timeline: a frame that lands past the next slot is preceded by repeats of
+    the previous one, and a frame that lands before it is skipped. The file
+    therefore plays back in real time whatever rate the effect chain ran at
+    and whatever the queue dropped.
+    """
+    def __init__(self, path, fps=30, codec="mp4v", queue_size=60, drop_policy="oldest"):
+        super().__init__(daemon=True)
+        self.path = path
+        self.fps = fps
+        self.codec = codec
+        self.drop_policy = drop_policy if drop_policy in DROP_POLICIES else "oldest"
+        self.frames = Queue(maxsize=max(1, queue_size))
+        self.writer = None
+        self.frame_size = None  # (width, height), fixed by the first frame
+        self.running = False
+        self.error = None
+        
+        # Position on the file's fps timeline
+        self.start_time = None
+        self.next_slot = 0
+        self.last_frame = None
+
+        # Stats, written by the encoder thread and read by the GUI
+        self.lock = Lock()
+        self.written = 0
+        self.dropped = 0
+        self.repeated = 0  # Extra copies written to fill time the pipeline didn't produce
+        self.skipped = 0   # Frames that arrived faster than the file's fps
+        self.encode_times = deque(maxlen=60)  # Wall-clock time of recent writes
+
+    def start(self):
+        self.running = True
+        super().start()
+
+    def push(self, frame):
+        """Queue a frame for encoding; drops instead of waiting when the encoder is behind"""
+        if not self.running:
+            return False
+        item = (time.monotonic(), frame)
+        try:
+            self.frames.put_nowait(item)
+            return True
+        except Full:
+            pass
+
+        with self.lock:
+            self.dropped += 1
+        if self.drop_policy == "newest":
+            return False
+
+        # Evict the oldest queued frame to make room for the newest one
+        try:
+            self.frames.get_nowait()
+        except Empty:
+            pass
+        try:
+            self.frames.put_nowait(item)
+            return True
+        except Full:
+            return False
+
+    def stop(self, timeout=5.0):
+        """Stop accepting frames, flush what is queued and close the file"""
+        self.running = False
+        if self.is_alive():
+            self.join(timeout)
+
+    def open_writer(self, frame):
+        height, width = frame.shape[:2]
+        self.frame_size = (width, height)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fourcc = cv2.VideoWriter_fourcc(*self.codec)
+        self.writer = cv2.VideoWriter(self.path, fourcc, self.fps, self.frame_size, frame.ndim == 3)
+        if not self.writer.isOpened():
+            raise RuntimeError(f"Could not open {self.path} for writing ({self.codec})")
+
+    def encode(self, timestamp, frame):
+        if self.writer is None:
+            self.open_writer(frame)
+            self.start_time = timestamp
+        slot = int(round((timestamp - self.start_time) * self.fps))
+        if slot < self.next_slot:
+            with self.lock:
+                self.skipped += 1
+            return
+        if (frame.shape[1], frame.shape[0]) != self.frame_size:
+            frame = cv2.resize(frame, self.frame_size, interpolation=cv2.INTER_AREA)
+            
+        # Hold the previous frame over slots nothing arrived for
+        repeats = slot - self.next_slot if self.last_frame is not None else 0
+        for _ in range(repeats):
+            self.writer.write(self.last_frame)
+        self.writer.write(frame)
+        self.last_frame = frame
+        self.next_slot = slot + 1
+        with self.lock:
+            self.written += 1
+            self.repeated += repeats
+            self.encode_times.append(time.perf_counter())
+
+    def run(self):
+        try:
+            # Keep draining after stop() so queued frames still reach the file
+            while self.running or not self.frames.empty():
+                try:
+                    timestamp, frame = self.frames.get(timeout=0.1)
+                except Empty:
+                    continue
+                self.encode(timestamp, frame)
+        except Exception as e:
+            print(f"Recording error: {str(e)}")
+            self.error = e
+            self.running = False
+        finally:
+            if self.writer is not None:
+                self.writer.release()
+
+    def stats(self):
+        """Encode FPS over the recent window, queue depth and frame counters"""
+        with self.lock:
+            times = list(self.encode_times)
+            written, dropped = self.written, self.dropped
+            repeated, skipped = self.repeated, self.skipped
+        encode_fps = 0.0
+        if len(times) > 1 and time.perf_counter() - times[-1] < 1.0:
+            encode_fps = (len(times) - 1) / max(times[-1] - times[0], 1e-6)
+        return {
+            "encode_fps": encode_fps,
+            "queue_depth": self.frames.qsize(),
+            "queue_size": self.frames.maxsize,
+            "written": written,
+            "dropped": dropped,
+            "repeated": repeated,
+            "skipped": skipped
+        }
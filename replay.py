@@ -0,0 +1,119 @@
+import os
+import time
+from collections import deque
+from queue import Queue, Full, Empty
+from threading import Thread, Lock
+from lazy_import import lazy_import
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+
+class ReplayBuffer(Thread):
+    """Keep the last few seconds of processed frames as JPEGs for instant replay"""
+    def __init__(self, seconds=30, budget_bytes=128 * 1024 * 1024, jpeg_quality=80, codec="mp4v"):
+        super().__init__(daemon=True)
+        self.seconds = seconds
+        self.budget_bytes = budget_bytes
+        self.jpeg_quality = jpeg_quality
+        self.codec = codec
+        self.incoming = Queue(maxsize=2)  # Frames waiting for the encoder
+        self.running = False
+
+        # (timestamp, jpeg bytes), trimmed to the time window and byte budget
+        self.lock = Lock()
+        self.frames = deque()
+        self.total_bytes = 0
+        self.dropped = 0
+
+    def start(self):
+        self.running = True
+        super().start()
+
+    def stop(self):
+        self.running = False
+
+    def push(self, frame):
+        """Hand a frame to the encoder; skips it rather than wait when the encoder is busy"""
+        if not self.running:
+            return False
+        try:
+            self.incoming.put_nowait((time.monotonic(), frame))
+            return True
+        except Full:
+            self.dropped += 1
+            return False
+
+    def run(self):
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]
+        while self.running:
+            try:
+                timestamp, frame = self.incoming.get(timeout=0.1)
+            except Empty:
+                continue
+            try:
+                ok, encoded = cv2.imencode(".jpg", frame, params)
+            except Exception as e:
+                print(f"Replay encode error: {str(e)}")
+                continue
+            if ok:
+                self.store(timestamp, encoded.tobytes())
+
+    def store(self, timestamp, data):
+        with self.lock:
+            self.frames.append((timestamp, data))
+            self.total_bytes += len(data)
+            oldest = timestamp - self.seconds
+            while self.frames and (self.frames[0][0] < oldest or self.total_bytes > self.budget_bytes):
+                self.total_bytes -= len(self.frames.popleft()[1])
+
+    def duration(self):
+        """Seconds of footage currently held"""
+        with self.lock:
+            if len(self.frames) < 2:
+                return 0.0
+            return self.frames[-1][0] - self.frames[0][0]
+
+    def save_clip(self, path, done_callback=None):
+        """Write the buffered footage to path on a background thread
+
+        done_callback(path, error) runs on that thread once the file is closed.
+        Returns False when there is nothing to save.
+        """
+        with self.lock:
+            frames = list(self.frames)
+        if not frames:
+            return False
+
+        def write():
+            error = None
+            writer = None
+            try:
+                # Play back at the rate the frames actually arrived
+                span = frames[-1][0] - frames[0][0]
+                fps = (len(frames) - 1) / span if span > 0 else 30.0
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                for _, data in frames:
+                    image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_UNCHANGED)
+                    if writer is None:
+                        size = (image.shape[1], image.shape[0])
+                        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*self.codec), fps, size, image.ndim == 3)
+                        if not writer.isOpened():
+                            raise RuntimeError(f"Could not open {path} for writing ({self.codec})")
+                    elif (image.shape[1], image.shape[0]) != size:
+                        # The processing scale changed while buffering
+                        image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+                    writer.write(image)
+            except Exception as e:
+                print(f"Replay save error: {str(e)}")
+                error = e
+            finally:
+                if writer is not None:
+                    writer.release()
+            if done_callback:
+                done_callback(path, error)
+
+        Thread(target=write, daemon=True).start()
+        return True
@@ -0,0 +1,81 @@
+from statistics import NormalDist
+from lazy_import import lazy_import
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+SCALAR_BATCH = 256  # Scalar draws generated at a time
+
+
+class EffectRng:
+    """Seedable random source for the effect chain
+
+    Frame-sized layers come straight out of the generator as uint8, and scalar
+    decisions are served from a pre-drawn batch instead of one call per draw.
+    The same seed gives the same sequence, for benchmarks and offline renders.
+    """
+    def __init__(self, seed=None):
+        self.seed(seed)
+        self.range_luts = {}
+        self.normal_luts = {}
+
+    def seed(self, seed=None):
+        self.generator = np.random.default_rng(seed)
+        self.scalars = None
+        self.scalar_index = SCALAR_BATCH
+
+    def random(self):
+        """Uniform float in [0, 1)"""
+        if self.scalar_index >= SCALAR_BATCH:
+            self.scalars = self.generator.random(SCALAR_BATCH).tolist()
+            self.scalar_index = 0
+        value = self.scalars[self.scalar_index]
+        self.scalar_index += 1
+        return value
+
+    def randint(self, low, high):
+        """Integer in [low, high], inclusive like random.randint"""
+        return low + int(self.random() * (high - low + 1))
+
+    def randints(self, low, high, size):
+        """Array of integers in [low, high], inclusive like randint"""
+        return self.generator.integers(low, high + 1, size)
+
+    def uniform(self, size):
+        """Array of uniform floats in [0, 1)"""
+        return self.generator.random(size)
+
+    def choice(self, sequence):
+        return sequence[int(self.random() * len(sequence))]
+
+    def uint8(self, shape, low=0, high=256):
+        """uint8 array of integers in [low, high)
+
+        Full-range bytes are the generator's fast path; narrower ranges are
+        mapped onto it through a lookup table instead of rejection sampling.
+        """
+        values = self.generator.integers(0, 256, shape, dtype=np.uint8)
+        if (low, high) == (0, 256):
+            return values
+        lut = self.range_luts.get((low, high))
+        if lut is None:
+            lut = np.array([low + (i * (high - low) >> 8) for i in range(256)], dtype=np.uint8)
+            self.range_luts[(low, high)] = lut
+        return cv2.LUT(values, lut)
+
+    def normal_uint8(self, shape, sigma):
+        """Zero-mean normal noise cast to uint8 (negative values wrap, like astype)
+
+        Uniform bytes are mapped through a 256-entry inverse-CDF table, so no
+        float64 frame is ever allocated.
+        """
+        key = round(float(sigma), 3)
+        lut = self.normal_luts.get(key)
+        if lut is None:
+            inverse = NormalDist(0.0, max(key, 1e-6)).inv_cdf
+            values = [int(inverse((i + 0.5) / 256)) % 256 for i in range(256)]
+            lut = np.array(values, dtype=np.uint8)
+            if len(self.normal_luts) > 64:
+                self.normal_luts.clear()
+            self.normal_luts[key] = lut
+        return cv2.LUT(self.generator.integers(0, 256, shape, dtype=np.uint8), lut)
@@ -0,0 +1,88 @@
+"""Startup timing.
+
+Set FNAF_PROFILE_STARTUP=1 to print a breakdown of where startup time goes,
+and run ``python -X importtime main.py`` for a per-module import breakdown.
+
+Import-time breakdown, measured with ``python -X importtime`` (cumulative ms,
+median of 3-5 runs; Python 3.11, numpy 2.4, opencv-python-headless 5.0, Linux):
+
+  Before the first window
+    argparse        15 ms
+    tkinter         20 ms
+    (startup + argparse + tkinter measured together in-process: 23 ms)
+
+  After the first window (GUI imports)
+    effects         88 ms  app modules with cv2/numpy still lazy, of which:
+      metrics       37 ms    almost all http.server (via faults)
+      config        13 ms    almost all tempfile (control socket path)
+      watcher       10 ms
+      logging        9 ms
+      rng            5 ms    statistics
+    yaml            36 ms  tips.yml
+
+  Lazy, on first use
+    numpy          124 ms  first frame through the effects or first asset decode
+    cv2             26 ms  on top of numpy; the full opencv-python wheel used on
+                           Windows (FFmpeg, DirectShow) loads more and is slower
+
+  Estimates, not measured here (not installed in the measuring environment)
+    customtkinter   needed before any widget can be built; expected to be the
+                    largest import on the path to the GUI
+    PIL             only needed to hand preview frames to CTkImage
+    pyvirtualcam    only needed when the virtual camera starts
+
+Time to first window needs a display and was not measured alongside these
+numbers; FNAF_PROFILE_STARTUP=1 reports it on a real desktop.
+
+Only argparse and tkinter are imported before the first window is drawn;
+customtkinter comes in with the GUI modules right after it.
+cv2, numpy, PIL and pyvirtualcam go through lazy_import and load on first use,
+config.py no longer touches the filesystem on import, and glitch frames and
+extra images are decoded by a background AssetLoader after the window is up.
+
+Target: first window on screen within 300 ms of process start on a warm disk
+cache, with asset loading progress shown in the status bar after that.
+"""
+import os
+import time
+
+FIRST_WINDOW_TARGET = 0.3  # seconds
+
+_process_start = time.perf_counter()
+
+
+class StartupTimer:
+    """Record named startup phases relative to process start"""
+    def __init__(self):
+        self.start = _process_start
+        self.marks = []
+        self.enabled = os.environ.get("FNAF_PROFILE_STARTUP", "") not in ("", "0")
+        
+    def mark(self, label):
+        """Record that a startup phase finished"""
+        self.marks.append((label, time.perf_counter()))
+        
+    def elapsed(self):
+        """Seconds since process start"""
+        return time.perf_counter() - self.start
+        
+    def report(self):
+        """Print the startup breakdown if profiling is enabled"""
+        if not self.enabled:
+            return
+            
+        print("Startup breakdown:")
+        previous = self.start
+        for label, timestamp in self.marks:
+            print(f"  {label:<28} {(timestamp - previous) * 1000:7.1f} ms  (at {(timestamp - self.start) * 1000:7.1f} ms)")
+            previous = timestamp
+            
+        for label, timestamp in self.marks:
+            if label == "first window":
+                total = timestamp - self.start
+                status = "OK" if total <= FIRST_WINDOW_TARGET else "over target"
+                print(f"  time to first window: {total * 1000:.1f} ms "
+                      f"(target {FIRST_WINDOW_TARGET * 1000:.0f} ms, {status})")
+
+
+timer = StartupTimer()
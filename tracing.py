@@ -0,0 +1,143 @@
+"""Per-frame latency tracing
+
+Every captured frame gets a sequence number and a capture timestamp, and the
+stages it passes through record spans against it: capture, downscale, each
+effect stage, each output sink, and finally the virtual camera send on the
+pacer thread. The newest frames are kept in a ring and can be exported as a
+Chrome trace (load it in chrome://tracing or Perfetto) or as CSV.
+"""
+import csv
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from config import DEFAULT_SETTINGS
+
+SUMMARY_FRAMES = 300  # Frames the rolling summary covers
+
+
+class FrameTrace:
+    __slots__ = ("seq", "capture_time", "thread", "spans", "sent")
+
+    def __init__(self, seq, capture_time, thread):
+        self.seq = seq
+        self.capture_time = capture_time  # perf_counter when cap.read() returned
+        self.thread = thread
+        self.spans = []                   # (name, start, end, thread)
+        self.sent = False
+
+
+class Tracer:
+    def __init__(self, capacity=1800, enabled=True):
+        self.enabled = enabled
+        self.frames = deque(maxlen=capacity)
+        self.latencies = deque(maxlen=SUMMARY_FRAMES)  # Capture to first send, seconds
+        self.sequence = itertools.count()
+        self.local = threading.local()
+        self.epoch = time.perf_counter()
+
+    def begin_frame(self, capture_start, capture_end):
+        """Start tracing a frame that was read between capture_start and capture_end"""
+        if not self.enabled:
+            return None
+        thread = threading.current_thread().name
+        trace = FrameTrace(next(self.sequence), capture_end, thread)
+        trace.spans.append(("capture", capture_start, capture_end, thread))
+        self.local.frame = trace
+        return trace
+
+    def current(self):
+        """The frame being processed on this thread, if any"""
+        return getattr(self.local, "frame", None)
+
+    def end_frame(self):
+        trace = self.current()
+        if trace is not None:
+            self.frames.append(trace)
+            self.local.frame = None
+
+    @contextmanager
+    def span(self, name):
+        """Time a block against the current frame"""
+        trace = self.current()
+        if trace is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            trace.spans.append((name, start, time.perf_counter(), trace.thread))
+
+    def frame_sent(self, trace, start, end):
+        """Record a virtual camera send; the first one sets the frame's latency"""
+        if trace is None:
+            return
+        trace.spans.append(("send", start, end, threading.current_thread().name))
+        if not trace.sent:
+            trace.sent = True
+            self.latencies.append(end - trace.capture_time)
+
+    def summary(self):
+        """Rolling capture-to-send latency and per-span durations, in milliseconds"""
+        def percentiles(values):
+            values = sorted(values)
+            if not values:
+                return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+            pick = lambda q: values[min(len(values) - 1, int(q * len(values)))] * 1000.0
+            return {"p50": pick(0.5), "p95": pick(0.95), "max": values[-1] * 1000.0}
+
+        durations = {}
+        for trace in list(self.frames)[-SUMMARY_FRAMES:]:
+            for name, start, end, _ in list(trace.spans):
+                durations.setdefault(name, []).append(end - start)
+        return {
+            "latency": percentiles(list(self.latencies)),
+            "spans": {name: percentiles(values) for name, values in durations.items()}
+        }
+
+    def events(self):
+        for trace in list(self.frames):
+            for name, start, end, thread in list(trace.spans):
+                yield trace, name, start, end, thread
+
+    def export_chrome(self, path):
+        events = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self.epoch) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": 1,
+                "tid": thread,
+                "args": {"seq": trace.seq}
+            }
+            for trace, name, start, end, thread in self.events()
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def export_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["seq", "span", "thread", "start_ms", "duration_ms", "since_capture_ms"])
+            for trace, name, start, end, thread in self.events():
+                writer.writerow([
+                    trace.seq, name, thread,
+                    f"{(start - self.epoch) * 1000:.3f}",
+                    f"{(end - start) * 1000:.3f}",
+                    f"{(end - trace.capture_time) * 1000:.3f}"
+                ])
+
+    def export(self, path):
+        """Export as CSV for .csv paths, Chrome trace JSON otherwise"""
+        if path.lower().endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_chrome(path)
+        return len(self.frames)
+
+
+tracer = Tracer(DEFAULT_SETTINGS["trace_frames"], DEFAULT_SETTINGS["tracing_enabled"])
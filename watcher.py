@@ -0,0 +1,166 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from threading import Thread
+
+# inotify event masks (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def snapshot(directory, extensions):
+    """Map each asset file in a directory to its (mtime, size)"""
+    files = {}
+    try:
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name.lower().endswith(extensions):
+                stat = entry.stat()
+                files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        pass
+    return files
+
+
+def diff_snapshots(old, new):
+    """Return (added, modified, removed) paths between two snapshots"""
+    added = [path for path in new if path not in old]
+    removed = [path for path in old if path not in new]
+    modified = [path for path in new if path in old and new[path] != old[path]]
+    return added, modified, removed
+
+
+class InotifyBackend:
+    """Block until something changes in the watched directories (Linux)"""
+    debounce = True
+    
+    def __init__(self, directories):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+            
+        self.watches = {}
+        for directory in directories:
+            wd = libc.inotify_add_watch(self.fd, directory.encode(), WATCH_MASK)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+            self.watches[wd] = directory
+            
+    def wait(self, timeout):
+        """Return the set of directories with pending events"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+            
+        changed = set()
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+            
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(buffer):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(buffer, offset)
+            offset += EVENT_HEADER.size + length
+            if wd in self.watches:
+                changed.add(self.watches[wd])
+        return changed
+        
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingBackend:
+    """Portable fallback: report every directory on each poll interval"""
+    debounce = False
+    
+    def __init__(self, directories, interval=1.0):
+        self.directories = set(directories)
+        self.interval = interval
+        
+    def wait(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        return set(self.directories)
+        
+    def close(self):
+        pass
+
+
+class AssetWatcher(Thread):
+    """Watch asset directories and report added, modified and removed files"""
+    def __init__(self, directories, on_change, settle_time=0.5, poll_interval=1.0):
+        super().__init__(daemon=True)
+        self.directories = dict(directories)  # {directory: extensions}
+        self.on_change = on_change            # on_change(directory, added, modified, removed)
+        self.settle_time = settle_time        # Wait for writes to finish before reloading
+        self.poll_interval = poll_interval
+        self.running = False
+        self.backend = None
+        self.snapshots = {
+            directory: snapshot(directory, extensions)
+            for directory, extensions in self.directories.items()
+        }
+        
+    def create_backend(self):
+        if sys.platform.startswith("linux"):
+            try:
+                return InotifyBackend(list(self.directories))
+            except (OSError, AttributeError) as e:
+                print(f"inotify unavailable, polling asset directories: {str(e)}")
+        return PollingBackend(list(self.directories), self.poll_interval)
+        
+    def run(self):
+        self.running = True
+        self.backend = self.create_backend()
+        dirty = set()
+        last_event = 0
+        
+        try:
+            while self.running:
+                changed = self.backend.wait(self.settle_time if dirty else 1.0)
+                now = time.monotonic()
+                if changed:
+                    dirty |= changed
+                    last_event = now
+                    if self.backend.debounce:
+                        # Keep collecting events until the directory goes quiet
+                        continue
+                        
+                if dirty and (not self.backend.debounce or now - last_event >= self.settle_time):
+                    for directory in list(dirty):
+                        self.rescan(directory)
+                    dirty.clear()
+        finally:
+            self.backend.close()
+            
+    def rescan(self, directory):
+        """Diff a directory against its last snapshot and report changes"""
+        current = snapshot(directory, self.directories[directory])
+        added, modified, removed = diff_snapshots(self.snapshots[directory], current)
+        if not (added or modified or removed):
+            return
+            
+        # Files still being written change size between scans; wait for the next one
+        time.sleep(0.05)
+        if snapshot(directory, self.directories[directory]) != current:
+            return
+            
+        self.snapshots[directory] = current
+        try:
+            self.on_change(directory, added, modified, removed)
+        except Exception as e:
+            print(f"Asset reload error: {str(e)}")
+            
+    def stop(self):
+        self.running = False